@@ -1,7 +1,10 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import orjson
 import os
+from collections import defaultdict
 from datetime import datetime, timedelta
 import time
 from dotenv import load_dotenv
@@ -9,7 +12,7 @@ import re
 
 # Import Notion integration
 try:
-    from notion_integration import NotionIntegration
+    from notion_integration import db_title, get_shared
     NOTION_AVAILABLE = True
 except ImportError:
     NOTION_AVAILABLE = False
@@ -119,29 +122,100 @@ DOMAIN_AREAS = [
 
 EXCLUDED_STATUSES = ["Canceled", "Cancelled", "Duplicate"]
 
+# Set views of DOMAIN_AREAS and EXCLUDED_STATUSES for constant-time lookups
+_DOMAIN_AREA_SET = frozenset(DOMAIN_AREAS)
+_EXCLUDED = frozenset(EXCLUDED_STATUSES)
+
+# Order of the category sections in the release notes
+_CATEGORY_ORDER = list(CATEGORY_MAPPINGS.values()) + ["Other Changes"]
+
+# Row templates for an issue line in the release notes, with and without a domain area
+_FMT_DOMAIN = "- {emoji} **{title}** ([{ident}]({url})) [{dom}]\n"
+_FMT_NODOM = "- {emoji} **{title}** ([{ident}]({url}))\n"
+
+# The only issue labels release notes care about; queries fetch just these
+CLASSIFIER_LABELS = list(CATEGORY_MAPPINGS) + DOMAIN_AREAS
+
+# Linear rejects any query scoring over 10,000 complexity points. A connection
+# scores its page size times the cost of each node (50 nodes if no `first` is
+# given), so every nested connection is bounded and page sizes are derived
+# from a budget kept below the limit to leave room for the estimate
+LINEAR_QUERY_BUDGET = 8000
+
+# Estimated points per issue selected in release queries: the issue, its state
+# and a labels connection of at most len(CLASSIFIER_LABELS) nodes
+ISSUE_COMPLEXITY = 3 + 1.1 * len(CLASSIFIER_LABELS)
+
+# Page sizes for paginated Linear queries (Linear allows at most 250)
+ISSUES_PAGE_SIZE = min(250, int(LINEAR_QUERY_BUDGET // ISSUE_COMPLEXITY))
+LABELS_PAGE_SIZE = 100
+
+# Seconds to wait for a Linear API response
+REQUEST_TIMEOUT = 30
+
+@st.cache_resource
+def get_linear_session(api_key):
+    """Keep-alive HTTP session for Linear, shared across Streamlit reruns"""
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
+    session.headers.update({
+        'Authorization': api_key,
+        'Content-Type': 'application/json',
+    })
+    return session
+
 def make_linear_request(query, variables=None):
     """Make a request to Linear API"""
-    headers = {
-        'Authorization': LINEAR_API_KEY,
-        'Content-Type': 'application/json',
-    }
-    
     payload = {
         'query': query,
         'variables': variables or {}
     }
     
-    response = requests.post(LINEAR_API_URL, json=payload, headers=headers)
-    return response.json()
+    session = get_linear_session(LINEAR_API_KEY)
+    response = session.post(LINEAR_API_URL, data=orjson.dumps(payload), timeout=REQUEST_TIMEOUT)
+    return orjson.loads(response.content)
+
+def fetch_all_nodes(query, variables, path, after=None):
+    """Collect every node of a paginated connection, starting after cursor `after`
+    
+    `query` must accept an `$after: String` variable and select
+    `pageInfo { hasNextPage endCursor }` on the connection found by following
+    `path` (a sequence of keys) under `data`.
+    
+    Returns (nodes, errors); errors is the GraphQL error list that stopped
+    pagination, or None.
+    """
+    variables = dict(variables or {})
+    variables['after'] = after
+    nodes = []
+    
+    while True:
+        result = make_linear_request(query, variables)
+        if 'errors' in result:
+            return nodes, result['errors']
+        
+        connection = result.get('data') or {}
+        for key in path:
+            connection = connection.get(key) or {}
+        nodes.extend(connection.get('nodes', []))
+        
+        page_info = connection.get('pageInfo') or {}
+        if not page_info.get('hasNextPage'):
+            return nodes, None
+        variables['after'] = page_info.get('endCursor')
 
 def get_issues_by_label(release_label):
     """Fetch issues by release label"""
     query = """
-    query IssuesByReleaseLabel($releaseLabel: String!) {
-        issues(filter: {
+    query IssuesByReleaseLabel($releaseLabel: String!, $classifierLabels: [String!], $after: String) {
+        issues(first: %d, after: $after, filter: {
             labels: { name: { eq: $releaseLabel } },
             parent: { null: true }
         }) {
+            pageInfo {
+                hasNextPage
+                endCursor
+            }
             nodes {
                 identifier
                 title
@@ -149,7 +223,7 @@ def get_issues_by_label(release_label):
                 state {
                     name
                 }
-                labels {
+                labels(first: %d, filter: { name: { in: $classifierLabels } }) {
                     nodes {
                         name
                     }
@@ -157,22 +231,27 @@ def get_issues_by_label(release_label):
             }
         }
     }
-    """
+    """ % (ISSUES_PAGE_SIZE, len(CLASSIFIER_LABELS))
     
-    result = make_linear_request(query, {'releaseLabel': release_label})
-    if 'errors' in result:
-        st.error(f"Error fetching issues: {result['errors']}")
+    variables = {'releaseLabel': release_label, 'classifierLabels': CLASSIFIER_LABELS}
+    issues, errors = fetch_all_nodes(query, variables, ('issues',))
+    if errors:
+        st.error(f"Error fetching issues: {errors}")
         return []
     
-    return result.get('data', {}).get('issues', {}).get('nodes', [])
+    return issues
 
 def get_release_labels():
     """Fetch all release labels from Linear"""
     query = """
-    query {
+    query Labels($after: String) {
         viewer {
             organization {
-                labels {
+                labels(first: %d, after: $after) {
+                    pageInfo {
+                        hasNextPage
+                        endCursor
+                    }
                     nodes {
                         name
                         createdAt
@@ -185,15 +264,13 @@ def get_release_labels():
             }
         }
     }
-    """
+    """ % LABELS_PAGE_SIZE
     
-    result = make_linear_request(query)
-    if 'errors' in result:
-        st.error(f"Error fetching labels: {result['errors']}")
+    labels, errors = fetch_all_nodes(query, None, ('viewer', 'organization', 'labels'))
+    if errors:
+        st.error(f"Error fetching labels: {errors}")
         return []
     
-    labels = result.get('data', {}).get('viewer', {}).get('organization', {}).get('labels', {}).get('nodes', [])
-    
     # Filter for labels that belong to the "Release" group
     release_labels = []
     for label in labels:
@@ -218,35 +295,25 @@ def get_release_labels():
     release_labels.sort(key=version_key, reverse=True)
     return release_labels
 
-def determine_category(issue):
-    """Determine category based on issue labels"""
-    issue_labels = [label['name'] for label in issue['labels']['nodes']]
+def classify_issue(issue):
+    """Determine category and domain area from issue labels in one pass
     
-    for label in issue_labels:
-        if label in CATEGORY_MAPPINGS:
-            return CATEGORY_MAPPINGS[label]
-    
-    return "Other Changes"
-
-def find_domain_area(issue):
-    """Find domain area from issue labels"""
-    issue_labels = [label['name'] for label in issue['labels']['nodes']]
-    
-    for label in issue_labels:
-        if label in DOMAIN_AREAS:
-            return label
-    
-    return None
-
-def get_status_emoji(issue):
-    """Get status emoji for an issue"""
-    state_name = issue['state']['name']
-    return STATUS_EMOJIS.get(state_name, "")
-
-def should_exclude_issue(issue):
-    """Check if issue should be excluded"""
-    state_name = issue['state']['name']
-    return state_name in EXCLUDED_STATUSES
+    For each, the first matching label in the issue's label order wins.
+    Returns a (category, domain_area) tuple; domain_area may be None.
+    """
+    category = None
+    domain_area = None
+    
+    for label in issue['labels']['nodes']:
+        name = label['name']
+        if category is None and name in CATEGORY_MAPPINGS:
+            category = CATEGORY_MAPPINGS[name]
+        if domain_area is None and name in _DOMAIN_AREA_SET:
+            domain_area = name
+        if category is not None and domain_area is not None:
+            break
+    
+    return category or "Other Changes", domain_area
 
 def generate_release_notes(issues, release_version):
     """Generate release notes markdown"""
@@ -254,19 +321,15 @@ def generate_release_notes(issues, release_version):
         return "No issues found for this release."
     
     # Filter out excluded issues
-    filtered_issues = [issue for issue in issues if not should_exclude_issue(issue)]
+    filtered_issues = [issue for issue in issues if issue['state']['name'] not in _EXCLUDED]
     
     # Group issues by category
-    categorized_issues = {}
-    for category in CATEGORY_MAPPINGS.values():
-        categorized_issues[category] = []
-    categorized_issues["Other Changes"] = []
+    categorized_issues = defaultdict(list)
     
     # Categorize issues
     for issue in filtered_issues:
-        category = determine_category(issue)
-        domain_area = find_domain_area(issue)
-        status_emoji = get_status_emoji(issue)
+        category, domain_area = classify_issue(issue)
+        status_emoji = STATUS_EMOJIS.get(issue['state']['name'], "")
         
         categorized_issues[category].append({
             'title': issue['title'],
@@ -277,22 +340,26 @@ def generate_release_notes(issues, release_version):
         })
     
     # Generate markdown
-    markdown = f"# 🚀 Changelog - {release_version}\n\n"
-    markdown += f"*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n\n"
+    parts = [
+        f"# 🚀 Changelog - {release_version}\n\n",
+        f"*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n\n"
+    ]
     
-    for category, issues_list in categorized_issues.items():
+    for category in _CATEGORY_ORDER:
+        issues_list = categorized_issues.get(category)
         if issues_list:
-            markdown += f"## {category}\n\n"
+            parts.append(f"## {category}\n\n")
             
             for issue in issues_list:
-                markdown += f"- {issue['status_emoji']} **{issue['title']}** ([{issue['identifier']}]({issue['url']}))"
-                if issue['domain_area']:
-                    markdown += f" [{issue['domain_area']}]"
-                markdown += "\n"
+                dom = issue['domain_area']
+                parts.append((_FMT_DOMAIN if dom else _FMT_NODOM).format(
+                    emoji=issue['status_emoji'], title=issue['title'],
+                    ident=issue['identifier'], url=issue['url'], dom=dom
+                ))
             
-            markdown += "\n"
+            parts.append("\n")
     
-    return markdown
+    return "".join(parts)
 
 def check_password():
     """Returns `True` if the user had the correct password."""
@@ -450,7 +517,7 @@ def main():
                 if st.button("Create New Notion Page", type="secondary", key="create_notion_page"):
                     st.write("Button clicked! Starting Notion page creation...")
                     try:
-                        notion = NotionIntegration()
+                        notion = get_shared()
                         database_id = st.session_state.get('selected_database_id')
                         
                         # Debug information
@@ -477,7 +544,7 @@ def main():
             with col2:
                 if st.button("Update Existing Page", type="secondary", key="update_notion_page"):
                     try:
-                        notion = NotionIntegration()
+                        notion = get_shared()
                         database_id = st.session_state.get('selected_database_id')
                         
                         with st.spinner("Searching for existing page..."):
@@ -605,12 +672,12 @@ def main():
             # Automatically set the database ID if available
             if 'selected_database_id' not in st.session_state:
                 try:
-                    notion = NotionIntegration()
+                    notion = get_shared()
                     databases = notion.get_databases()
                     if databases:
                         # Look for the "Changelog" database
                         for db in databases:
-                            title = db.get('title', [{}])[0].get('plain_text', '')
+                            title = db_title(db, '')
                             if 'changelog' in title.lower():
                                 st.session_state['selected_database_id'] = db['id']
                                 break
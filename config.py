@@ -0,0 +1,35 @@
+"""
+Settings read from the environment (and .env) once per process
+"""
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from env_bootstrap import ensure_loaded
+
+DEFAULT_WORKSPACE_URL = 'https://linear.app/your-workspace'
+
+@dataclass(frozen=True)
+class Settings:
+    """Environment configuration shared by the scripts"""
+    linear_api_key: Optional[str]
+    linear_workspace_url: str
+    notion_token: Optional[str]
+    notion_db_id: Optional[str]
+    notion_page_id: Optional[str]
+    app_password: Optional[str]
+
+@lru_cache(maxsize=1)
+def settings() -> Settings:
+    """Load .env and snapshot the settings; later calls return the same object"""
+    ensure_loaded()
+    return Settings(
+        linear_api_key=os.getenv('LINEAR_API_KEY'),
+        linear_workspace_url=os.getenv('LINEAR_WORKSPACE_URL', DEFAULT_WORKSPACE_URL),
+        notion_token=os.getenv('NOTION_TOKEN'),
+        notion_db_id=os.getenv('NOTION_DATABASE_ID'),
+        notion_page_id=os.getenv('NOTION_PARENT_PAGE_ID'),
+        app_password=os.getenv('APP_PASSWORD'),
+    )
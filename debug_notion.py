@@ -4,11 +4,10 @@ Debug script for Notion integration
 """
 
 import os
-import streamlit as st
-from dotenv import load_dotenv
+from env_bootstrap import ensure_loaded
 
 # Load environment variables
-load_dotenv()
+ensure_loaded()
 
 def debug_notion_setup():
     """Debug Notion setup step by step"""
@@ -26,6 +25,7 @@ def debug_notion_setup():
     # Test 2: Check Streamlit secrets
     print("\n2. Checking Streamlit secrets:")
     try:
+        import streamlit as st
         if hasattr(st, 'secrets') and st.secrets:
             st_secret = st.secrets.get('NOTION_TOKEN')
             if st_secret:
@@ -40,7 +40,7 @@ def debug_notion_setup():
     # Test 3: Test NotionIntegration class
     print("\n3. Testing NotionIntegration class:")
     try:
-        from notion_integration import NotionIntegration
+        from notion_integration import NotionIntegration, db_title
         notion = NotionIntegration()
         print("   ✅ NotionIntegration initialized successfully")
         
@@ -51,7 +51,7 @@ def debug_notion_setup():
         
         if databases:
             for db in databases[:3]:
-                title = db.get('title', [{}])[0].get('plain_text', 'Untitled')
+                title = db_title(db)
                 print(f"   - {title} ({db['id']})")
         else:
             print("   ⚠️  No databases found - check if integration has permissions")
@@ -0,0 +1,46 @@
+"""
+Load .env into the process environment exactly once
+
+If tools/freeze_env.py has produced an env_snapshot.py that is at least as
+new as .env, its values are imported instead of parsing .env.
+"""
+
+import importlib.util
+import os
+from dotenv import load_dotenv
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+_ENV_FILE = os.path.join(_ROOT, '.env')
+_SNAPSHOT_FILE = os.path.join(_ROOT, 'env_snapshot.py')
+
+_LOADED = False
+
+def _load_snapshot():
+    """Apply env_snapshot.ENV unless it is missing or older than .env
+    
+    Returns True if the snapshot was used.
+    """
+    try:
+        if os.path.exists(_ENV_FILE) and os.path.getmtime(_ENV_FILE) > os.path.getmtime(_SNAPSHOT_FILE):
+            return False
+        # Load the snapshot by path so it is the file whose mtime was just checked,
+        # not whichever env_snapshot comes first on sys.path
+        spec = importlib.util.spec_from_file_location('env_snapshot', _SNAPSHOT_FILE)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        env = module.ENV
+    except (OSError, ImportError, AttributeError):
+        return False
+    
+    # Like load_dotenv, never override variables already set in the environment
+    for key, value in env.items():
+        os.environ.setdefault(key, value)
+    return True
+
+def ensure_loaded():
+    """Load .env on the first call; later calls do nothing"""
+    global _LOADED
+    if not _LOADED:
+        if not _load_snapshot():
+            load_dotenv()
+        _LOADED = True
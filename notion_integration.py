@@ -4,17 +4,256 @@ Notion Integration for Linear Release Notes Generator
 This module handles creating and updating Notion pages with release notes.
 """
 
+import difflib
+import functools
+import io
 import os
+import random
 import re
-from datetime import datetime
-from typing import Optional, Dict, List, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Optional, Callable, Dict, List, Any, Iterator, Tuple
+import httpx
 from notion_client import Client
-from dotenv import load_dotenv
+from notion_client.errors import HTTPResponseError
+from notion_client.helpers import collect_paginated_api
+from env_bootstrap import ensure_loaded
 
 # Load environment variables
-load_dotenv()
+ensure_loaded()
+
+# How long a retrieved database schema is reused before asking Notion again
+SCHEMA_CACHE_TTL = 300
+
+# How long the list of shared databases is reused before searching again
+DATABASES_CACHE_TTL = 60
+
+# Upper bound on concurrent Notion requests issued by a single call
+MAX_WORKERS = 4
+
+# Kept-alive HTTP connections per client; comfortably above MAX_WORKERS plus prefetching
+HTTP_POOL_SIZE = 16
+
+# Notion accepts at most this many children per create/append request
+NOTION_BLOCK_LIMIT = 100
+
+# Largest page size Notion allows for paginated endpoints such as database query and search
+NOTION_PAGE_SIZE = 100
+
+# Notion's documented average request rate per integration, and how many
+# requests may go out back to back before the limiter starts spacing them
+NOTION_REQUESTS_PER_SECOND = 3
+NOTION_REQUEST_BURST = 10
+
+# HTTP statuses worth retrying: rate limiting, which is always safe to retry
+# since Notion rejected the request, and transient gateway errors, which are
+# only retried for requests that can be repeated without duplicating anything
+RATE_LIMITED_STATUS = 429
+SERVER_ERROR_STATUSES = (502, 503, 504)
+
+# Longest we will wait for a rate limit to reset before retrying
+MAX_RATE_LIMIT_WAIT = 60
+
+# Markdown patterns used while converting release notes to Notion blocks
+_LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+_BOLD_RE = re.compile(r'\*\*([^*]+)\*\*')
+_ITALIC_RE = re.compile(r'\*([^*]+)\*')
+_NUMBERED_RE = re.compile(r'^\d+\. ')
+_NON_CATEGORY_RE = re.compile(r'[^\w\s-]')
+
+# Heading marker -> Notion block type
+_HEADING_TYPES = {'#': 'heading_1', '##': 'heading_2', '###': 'heading_3'}
+
+# Annotation objects shared by every bold/italic span; they are never mutated
+_BOLD = {"bold": True}
+_ITALIC = {"italic": True}
+
+def _text_item(content: str, link: Optional[Dict[str, str]] = None,
+               annotations: Optional[Dict[str, bool]] = None) -> Dict[str, Any]:
+    """Build a Notion rich text item, leaving out keys that aren't needed"""
+    text = {"content": content, "link": link} if link else {"content": content}
+    if annotations:
+        return {"text": text, "annotations": annotations}
+    return {"text": text}
+
+def _make_block(block_type: str, rich_text: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build a Notion block of the given type holding rich text"""
+    return {"object": "block", "type": block_type, block_type: {"rich_text": rich_text}}
+
+# Builds a page property value from (release_version, timestamp)
+PropertyWriter = Callable[[str, str], Dict[str, Any]]
+
+def _date_property(release_version: str, timestamp: str) -> Dict[str, Any]:
+    """Build a date property value starting at timestamp"""
+    return {"date": {"start": timestamp}}
+
+# Optional database property name -> {Notion property type: writer for that type}
+# Properties whose type has no builder (e.g. a read-only created_time column) are left alone
+_PROPERTY_BUILDERS: Dict[str, Dict[str, PropertyWriter]] = {
+    "Date": {"date": _date_property},
+    "Created Date": {"date": _date_property},
+}
+
+def _block_signature(block: Dict[str, Any]) -> Tuple[Any, ...]:
+    """
+    Summarise a block's type and visible text so existing and new blocks can be compared
+    
+    Works for both blocks read back from Notion and blocks built by
+    _make_block. Blocks with children never match anything.
+    """
+    block_type = block.get('type')
+    if block.get('has_children'):
+        return (block_type, block.get('id'))
+    
+    rich_text = block.get(block_type, {}).get('rich_text', [])
+    return (block_type, tuple(
+        (
+            item.get('text', {}).get('content'),
+            (item.get('text', {}).get('link') or {}).get('url'),
+            tuple(sorted(name for name, value in item.get('annotations', {}).items() if value is True)),
+        )
+        for item in rich_text
+    ))
+
+def _chunk(items: List[Any], size: int = NOTION_BLOCK_LIMIT) -> Iterator[List[Any]]:
+    """Yield consecutive slices of at most size items"""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def query_all(client: Client, database_id: str, page_size: int = NOTION_PAGE_SIZE, **query) -> Iterator[List[Dict]]:
+    """Yield every page of results of a database query
+    
+    The request for the next page goes out before the current page is yielded,
+    so fetching overlaps whatever the caller does with the results.
+    
+    Args:
+        client: Notion client to query with
+        database_id: ID of the database to query
+        page_size: Rows per request (Notion allows at most 100)
+        **query: Extra databases.query arguments such as filter or sorts
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(client.databases.query, database_id=database_id, page_size=page_size, **query)
+        while future is not None:
+            response = future.result()
+            future = None
+            if response.get('has_more') and response.get('next_cursor'):
+                future = executor.submit(
+                    client.databases.query, database_id=database_id, page_size=page_size,
+                    start_cursor=response['next_cursor'], **query
+                )
+            yield response.get('results', [])
+
+def db_title(db: Dict[str, Any], default: str = 'Untitled') -> str:
+    """Return the plain text of a database object's first title segment, or default"""
+    title = db.get('title')
+    return title[0]['plain_text'] if title else default
+
+# Streamlit secrets, probed on first use; None if Streamlit or its secrets are unavailable
+_STREAMLIT_SECRETS = None
+_STREAMLIT_PROBED = False
+
+def _streamlit_secrets():
+    """Return st.secrets if available, importing Streamlit at most once per process"""
+    global _STREAMLIT_SECRETS, _STREAMLIT_PROBED
+    if not _STREAMLIT_PROBED:
+        _STREAMLIT_PROBED = True
+        try:
+            import streamlit as st
+            if hasattr(st, 'secrets') and st.secrets:
+                _STREAMLIT_SECRETS = st.secrets
+        except Exception:
+            # Silently fail if Streamlit is not available
+            pass
+    return _STREAMLIT_SECRETS
+
+def _is_idempotent(path: str, method: str) -> bool:
+    """
+    Whether repeating a Notion request can't duplicate anything
+    
+    A gateway error may arrive after Notion already applied the request, so
+    only these requests are retried on one.
+    """
+    if method in ('GET', 'DELETE'):
+        return True
+    if method == 'PATCH':
+        # Appending children adds the blocks again; other updates overwrite
+        return not path.endswith('/children')
+    # POST creates pages, databases and comments, except for the read-only
+    # database query and search endpoints
+    return path == 'search' or path.endswith('/query')
+
+def _retry(max_attempts: int = 5, base: float = 0.25,
+           idempotent: Callable[..., bool] = lambda *args, **kwargs: True):
+    """
+    Retry a Notion call on rate limiting and transient server errors
+    
+    Rate limited calls are always retried. Server errors are retried only when
+    idempotent(*args, **kwargs) is true for the call. Waits for the server's
+    Retry-After header when present (at most MAX_RATE_LIMIT_WAIT seconds),
+    otherwise backs off exponentially (base * 2**attempt plus jitter).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(max_attempts):
+                try:
+                    return func(*args, **kwargs)
+                except HTTPResponseError as e:
+                    retryable = e.status == RATE_LIMITED_STATUS or (
+                        e.status in SERVER_ERROR_STATUSES and idempotent(*args, **kwargs)
+                    )
+                    if not retryable or attempt == max_attempts - 1:
+                        raise
+                    try:
+                        delay = min(float(e.headers.get('retry-after')), MAX_RATE_LIMIT_WAIT)
+                    except (TypeError, ValueError):
+                        delay = base * 2 ** attempt + random.uniform(0, base)
+                    time.sleep(delay)
+        return wrapper
+    return decorator
+
+class _RateLimiter:
+    """Token bucket that spaces out requests issued from any number of threads"""
+    
+    def __init__(self, rate: float, burst: int):
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a request may be sent"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            # Take a token now; a negative balance is the wait owed by this caller
+            self._tokens -= 1
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+# Shared by every client since Notion rate limits per integration, not per connection
+_rate_limiter = _RateLimiter(NOTION_REQUESTS_PER_SECOND, NOTION_REQUEST_BURST)
+
+class _RetryingClient(Client):
+    """Notion client whose every request is rate limited and goes through _retry"""
+    
+    @_retry(idempotent=lambda self, path, method, *args, **kwargs: _is_idempotent(path, method))
+    def request(self, path, method, *args, **kwargs):
+        _rate_limiter.acquire()
+        return super().request(path, method, *args, **kwargs)
 
 class NotionIntegration:
+    __slots__ = (
+        'notion_token', 'database_id', 'parent_page_id', 'client',
+        '_schema_cache', '_schema_ttl', '_databases_cache', '_version_to_db',
+    )
+    
     def __init__(self):
         """Initialize Notion client"""
         # Try to get token from environment variables or Streamlit secrets
@@ -25,7 +264,23 @@ class NotionIntegration:
         if not self.notion_token:
             raise ValueError("NOTION_TOKEN not found in environment variables or Streamlit secrets")
         
-        self.client = Client(auth=self.notion_token)
+        self.client = _RetryingClient(
+            auth=self.notion_token,
+            client=httpx.Client(limits=httpx.Limits(
+                max_connections=HTTP_POOL_SIZE,
+                max_keepalive_connections=HTTP_POOL_SIZE
+            ))
+        )
+        
+        # database_id -> (retrieved at, properties, property name -> writer)
+        self._schema_cache: Dict[str, Tuple[float, dict, Dict[str, PropertyWriter]]] = {}
+        self._schema_ttl = SCHEMA_CACHE_TTL
+        
+        # (retrieved at, databases) from the last search, if any
+        self._databases_cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
+        
+        # release version -> database its page was last seen in
+        self._version_to_db: Dict[str, str] = {}
     
     def _get_env_var(self, var_name):
         """Get environment variable, checking both os.environ and st.secrets"""
@@ -35,15 +290,14 @@ class NotionIntegration:
             return value
         
         # If not found, try to get from Streamlit secrets (cloud deployment)
-        try:
-            import streamlit as st
-            if hasattr(st, 'secrets') and st.secrets:
-                secret_value = st.secrets.get(var_name)
+        secrets = _streamlit_secrets()
+        if secrets:
+            try:
+                secret_value = secrets.get(var_name)
                 if secret_value:
                     return secret_value
-        except Exception as e:
-            # Silently fail if Streamlit is not available
-            pass
+            except Exception:
+                pass
         
         return None
     
@@ -61,8 +315,12 @@ class NotionIntegration:
             Page ID of the created page
         """
         try:
-            # Convert markdown to Notion blocks
-            blocks = self._markdown_to_notion_blocks(markdown_content)
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                # Fetch the database schema while the markdown is converted
+                writers_future = executor.submit(self._get_property_writers, database_id) if database_id else None
+                
+                # Convert markdown to Notion blocks
+                blocks = self._markdown_to_notion_blocks(markdown_content)
             
             # Prepare page properties - start with the required Name property
             properties = {
@@ -80,100 +338,222 @@ class NotionIntegration:
             # Try to add additional properties if they exist in the database
             try:
                 # Get database schema to see what properties are available
-                if database_id:
-                    db_properties = self._get_database_schema(database_id)
+                if writers_future:
+                    property_writers = writers_future.result()
                     
-                    # Add Date if it exists (date type)
-                    if 'Date' in db_properties:
-                        properties["Date"] = {
-                            "date": {
-                                "start": datetime.now().isoformat()
-                            }
-                        }
+                    # One timezone-aware timestamp shared by every date property
+                    now_iso = datetime.now(timezone.utc).isoformat()
                     
-                    # Add Created Date if it exists (date type)
-                    if 'Created Date' in db_properties:
-                        properties["Created Date"] = {
-                            "date": {
-                                "start": datetime.now().isoformat()
-                            }
-                        }
+                    # Fill in every optional property the database has, in the type it expects
+                    for name, writer in property_writers.items():
+                        properties[name] = writer(release_version, now_iso)
                     
             except Exception as e:
                 # If we can't get the database schema, just use basic properties
                 print(f"Warning: Could not retrieve database schema: {e}")
                 pass
             
-            # Create the page
-            if database_id:
-                # Create in specific database
-                page = self.client.pages.create(
-                    parent={"database_id": database_id},
-                    properties=properties,
-                    children=blocks
-                )
-            elif self.database_id:
-                # Create in default database
-                page = self.client.pages.create(
-                    parent={"database_id": self.database_id},
-                    properties=properties,
-                    children=blocks
-                )
+            # Create the page in the given database, the default database, under
+            # the parent page, or (with no parent at all) in the user's workspace
+            target_database_id = database_id or self.database_id
+            if target_database_id:
+                parent = {"database_id": target_database_id}
             elif self.parent_page_id:
-                # Create as child page
-                page = self.client.pages.create(
-                    parent={"page_id": self.parent_page_id},
-                    properties=properties,
-                    children=blocks
-                )
+                parent = {"page_id": self.parent_page_id}
             else:
-                # Create in user's workspace
-                page = self.client.pages.create(
-                    properties=properties,
-                    children=blocks
-                )
+                parent = None
+            
+            create_kwargs = {
+                "properties": properties,
+                "children": blocks[:NOTION_BLOCK_LIMIT]
+            }
+            if parent:
+                create_kwargs["parent"] = parent
+            page = self.client.pages.create(**create_kwargs)
             
             page_id = page["id"]
+            self._remember_database(release_version, page)
+            
+            # Anything past the first request's limit is appended in order
+            self._append_blocks(page_id, blocks[NOTION_BLOCK_LIMIT:])
             
             return page_id
             
         except Exception as e:
             raise Exception(f"Failed to create Notion page: {str(e)}")
     
-    def update_existing_page(self, page_id: str, markdown_content: str) -> bool:
+    def update_existing_page(self, page_id: str, markdown_content: str, diff: bool = True) -> bool:
         """
         Update an existing Notion page with new release notes
         
         Args:
             page_id: Notion page ID to update
             markdown_content: New markdown content
+            diff: Only rewrite the blocks that changed; when False (or when the
+                change can't be expressed as in-place edits) every block is
+                deleted and the page is rebuilt
             
         Returns:
             True if successful
         """
         try:
-            # Convert markdown to Notion blocks
-            blocks = self._markdown_to_notion_blocks(markdown_content)
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                # List the current content while the markdown is converted
+                existing_future = executor.submit(
+                    collect_paginated_api, self.client.blocks.children.list, block_id=page_id
+                )
+                
+                # Convert markdown to Notion blocks
+                blocks = self._markdown_to_notion_blocks(markdown_content)
             
-            # Clear existing content by getting all blocks and deleting them one by one
             try:
-                existing_blocks = self.client.blocks.children.list(page_id)
-                for block in existing_blocks.get('results', []):
-                    try:
-                        self.client.blocks.delete(block['id'])
-                    except Exception as e:
-                        print(f"Warning: Could not delete block {block['id']}: {e}")
+                existing_blocks = existing_future.result()
             except Exception as e:
                 print(f"Warning: Could not clear existing content: {e}")
+                existing_blocks = []
             
-            # Add new content
-            self.client.blocks.children.append(page_id, children=blocks)
+            if diff and existing_blocks and self._sync_changed_blocks(page_id, existing_blocks, blocks):
+                return True
+            
+            # Clear existing content, then add new content
+            self._delete_blocks([block['id'] for block in existing_blocks])
+            self._append_blocks(page_id, blocks)
             
             return True
             
         except Exception as e:
             raise Exception(f"Failed to update Notion page: {str(e)}")
     
+    def _sync_changed_blocks(self, page_id: str, existing_blocks: List[Dict[str, Any]],
+                             blocks: List[Dict[str, Any]]) -> bool:
+        """
+        Turn the page's current blocks into the new ones with minimal edits
+        
+        Unchanged blocks are left alone, changed blocks of the same type are
+        updated in place, and the rest are deleted or inserted after the
+        nearest block that stays.
+        
+        Args:
+            page_id: Notion page ID being updated
+            existing_blocks: Block objects currently on the page, in order
+            blocks: New Notion block objects, in order
+            
+        Returns:
+            False without touching the page if the edit can't be expressed this
+            way (new blocks would have to go before the first kept block)
+        """
+        matcher = difflib.SequenceMatcher(
+            None,
+            [_block_signature(block) for block in existing_blocks],
+            [_block_signature(block) for block in blocks],
+            autojunk=False
+        )
+        
+        updates = []  # (block_id, new block)
+        deletes = []  # block_id
+        inserts = []  # (block_id to insert after, new blocks)
+        anchor = None  # last existing block that stays on the page
+        pending = []  # new blocks waiting to be inserted after anchor
+        
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            old_run = existing_blocks[i1:i2]
+            new_run = blocks[j1:j2]
+            
+            if tag == 'equal':
+                kept = [(old, None) for old in old_run]
+            else:
+                kept = [
+                    (old_run[k] if k < len(old_run) else None, new_run[k] if k < len(new_run) else None)
+                    for k in range(max(len(old_run), len(new_run)))
+                ]
+            
+            for old, new in kept:
+                stays = old is not None and (
+                    tag == 'equal'
+                    or (new is not None and old.get('type') == new['type'] and not old.get('has_children'))
+                )
+                
+                if not stays:
+                    if old is not None:
+                        deletes.append(old['id'])
+                    if new is not None:
+                        pending.append(new)
+                    continue
+                
+                if pending:
+                    if anchor is None:
+                        return False
+                    inserts.append((anchor, pending))
+                    pending = []
+                
+                if new is not None:
+                    updates.append((old['id'], new))
+                anchor = old['id']
+        
+        if pending:
+            # With no anchor every old block is deleted, so appending at the end is correct
+            inserts.append((anchor, pending))
+        
+        # Updates and deletes touch separate blocks, so they share one bounded pool
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = [
+                executor.submit(self.client.blocks.update, block_id, **{block['type']: block[block['type']]})
+                for block_id, block in updates
+            ]
+            futures.extend(executor.submit(self._delete_block, block_id) for block_id in deletes)
+            for future in futures:
+                future.result()
+        
+        # Inserts stay sequential; each one is positioned relative to the page as it stands
+        for after, new_blocks in inserts:
+            self._append_blocks(page_id, new_blocks, after=after)
+        
+        return True
+    
+    def _append_blocks(self, block_id: str, blocks: List[Dict[str, Any]],
+                       after: Optional[str] = None) -> None:
+        """
+        Append blocks to a page or block, splitting them into requests Notion accepts
+        
+        Args:
+            block_id: Notion page or block ID to append to
+            blocks: Notion block objects, in display order
+            after: Optional ID of an existing child to insert the blocks after;
+                they go at the end otherwise
+        """
+        # Chunks go out one after another so the blocks keep their order
+        for chunk in _chunk(blocks):
+            if after:
+                response = self.client.blocks.children.append(block_id, children=chunk, after=after)
+                # The response lists the newly created blocks; the next chunk follows the last one
+                after = response['results'][-1]['id']
+            else:
+                self.client.blocks.children.append(block_id, children=chunk)
+    
+    def _delete_blocks(self, block_ids: List[str]) -> None:
+        """
+        Delete blocks concurrently; they are independent of each other
+        
+        Args:
+            block_ids: Notion block IDs to delete
+        """
+        if not block_ids:
+            return
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            list(executor.map(self._delete_block, block_ids))
+    
+    def _delete_block(self, block_id: str) -> None:
+        """
+        Delete a single block, logging instead of raising on failure
+        
+        Args:
+            block_id: Notion block ID to delete
+        """
+        try:
+            self.client.blocks.delete(block_id)
+        except Exception as e:
+            print(f"Warning: Could not delete block {block_id}: {e}")
+    
     def find_existing_page(self, release_version: str, database_id: Optional[str] = None) -> Optional[str]:
         """
         Find an existing page for a specific release version
@@ -185,49 +565,136 @@ class NotionIntegration:
         Returns:
             Page ID if found, None otherwise
         """
+        return self.find_existing_pages([release_version], database_id).get(release_version)
+    
+    def find_existing_pages(self, release_versions: List[str],
+                            database_id: Optional[str] = None) -> Dict[str, str]:
+        """
+        Find existing pages for several release versions at once
+        
+        When a database is available all versions are looked up with one
+        "or" filtered query (per 100 versions) instead of one query each.
+        
+        Args:
+            release_versions: Version numbers to search for
+            database_id: Optional database ID to search in
+            
+        Returns:
+            Dictionary mapping each found version to its page ID
+        """
+        found = {}
+        
         try:
-            search_query = f"Changelog - {release_version}"
+            target_database_id = database_id or self.database_id
             
-            if database_id:
-                # Search in specific database
-                response = self.client.databases.query(
-                    database_id=database_id,
-                    filter={
-                        "property": "Name",
-                        "title": {
-                            "equals": search_query
-                        }
-                    }
-                )
-            elif self.database_id:
-                # Search in default database
-                response = self.client.databases.query(
-                    database_id=self.database_id,
-                    filter={
-                        "property": "Name",
-                        "title": {
-                            "equals": search_query
-                        }
-                    }
-                )
-            else:
-                # Search in all pages
+            if target_database_id:
+                found.update(self._query_pages_by_version(target_database_id, release_versions))
+                return found
+            
+            # Versions found before can go straight to their database instead of search
+            versions_by_database = {}
+            for release_version in release_versions:
+                known_database_id = self._version_to_db.get(release_version)
+                if known_database_id:
+                    versions_by_database.setdefault(known_database_id, []).append(release_version)
+            for known_database_id, versions in versions_by_database.items():
+                found.update(self._query_pages_by_version(known_database_id, versions))
+            
+            # Search in all pages; search has no title filter so go one version at a time
+            for release_version in release_versions:
+                if release_version in found:
+                    continue
                 response = self.client.search(
-                    query=search_query,
+                    query=f"Changelog - {release_version}",
                     filter={
                         "property": "object",
                         "value": "page"
-                    }
+                    },
+                    page_size=1
                 )
+                if response["results"]:
+                    page = response["results"][0]
+                    found[release_version] = page["id"]
+                    self._remember_database(release_version, page)
             
-            if response["results"]:
-                return response["results"][0]["id"]
-            
-            return None
+            return found
             
         except Exception as e:
             print(f"Warning: Failed to search for existing page: {str(e)}")
-            return None
+            return found
+    
+    def _query_pages_by_version(self, database_id: str, release_versions: List[str]) -> Dict[str, str]:
+        """
+        Look up the pages for several release versions in one database
+        
+        Versions are matched with one "or" filtered query per 100 versions.
+        
+        Args:
+            database_id: Notion database ID to query
+            release_versions: Version numbers to search for
+            
+        Returns:
+            Dictionary mapping each found version to its page ID
+        """
+        found = {}
+        titles = {f"Changelog - {version}": version for version in release_versions}
+        
+        for title_batch in _chunk(list(titles), 100):
+            pending = set(title_batch)
+            filter_ = {
+                "or": [
+                    {"property": "Name", "title": {"equals": title}}
+                    for title in title_batch
+                ]
+            }
+            query_kwargs = {}
+            
+            # Stop paging as soon as every title in the batch has been matched
+            while pending:
+                response = self.client.databases.query(
+                    database_id=database_id,
+                    filter=filter_,
+                    page_size=min(len(pending), 100),
+                    **query_kwargs
+                )
+                
+                for page in response["results"]:
+                    title = self._page_title(page)
+                    if title in pending:
+                        pending.discard(title)
+                        found[titles[title]] = page["id"]
+                        self._version_to_db[titles[title]] = database_id
+                
+                if not response.get("has_more"):
+                    break
+                query_kwargs["start_cursor"] = response["next_cursor"]
+        
+        return found
+    
+    def _remember_database(self, release_version: str, page: Dict[str, Any]) -> None:
+        """
+        Record which database a release version's page lives in
+        
+        Args:
+            release_version: Version number of the page
+            page: Notion page object
+        """
+        parent_database_id = page.get("parent", {}).get("database_id")
+        if parent_database_id:
+            self._version_to_db[release_version] = parent_database_id
+    
+    def _page_title(self, page: Dict[str, Any]) -> str:
+        """
+        Get the plain text of a database page's Name title
+        
+        Args:
+            page: Notion page object
+            
+        Returns:
+            Title text, or an empty string if the page has none
+        """
+        title = page.get("properties", {}).get("Name", {}).get("title", [])
+        return "".join(part.get("plain_text", "") for part in title)
     
     def _markdown_to_notion_blocks(self, markdown_content: str) -> List[Dict[str, Any]]:
         """
@@ -239,81 +706,61 @@ class NotionIntegration:
         Returns:
             List of Notion block objects
         """
+        return self._parse_markdown(markdown_content)[0]
+    
+    def _parse_markdown(self, markdown_content: str) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Convert markdown to Notion blocks and collect its categories in a single pass
+        
+        Args:
+            markdown_content: Markdown string
+            
+        Returns:
+            Tuple of (Notion block objects, category names from "## " headings)
+        """
         blocks = []
-        lines = markdown_content.split('\n')
+        categories = []
         
-        for line in lines:
+        # Iterate lazily instead of materialising a list of every line
+        for line in io.StringIO(markdown_content):
             line = line.strip()
             if not line:
                 continue
             
+            # Dispatch on the first character; anything unmatched is a paragraph
+            block_type = "paragraph"
+            text = line
+            first = line[0]
+            
             # Handle headers
-            if line.startswith('# '):
-                rich_text = self._parse_rich_text(line[2:])
-                blocks.append({
-                    "object": "block",
-                    "type": "heading_1",
-                    "heading_1": {
-                        "rich_text": rich_text
-                    }
-                })
-            elif line.startswith('## '):
-                rich_text = self._parse_rich_text(line[3:])
-                blocks.append({
-                    "object": "block",
-                    "type": "heading_2",
-                    "heading_2": {
-                        "rich_text": rich_text
-                    }
-                })
-            elif line.startswith('### '):
-                rich_text = self._parse_rich_text(line[4:])
-                blocks.append({
-                    "object": "block",
-                    "type": "heading_3",
-                    "heading_3": {
-                        "rich_text": rich_text
-                    }
-                })
+            if first == '#':
+                marker, sep, rest = line.partition(' ')
+                if sep and marker in _HEADING_TYPES:
+                    block_type = _HEADING_TYPES[marker]
+                    text = rest
             
             # Handle bullet points
-            elif line.startswith('- '):
-                content = line[2:]
-                rich_text = self._parse_rich_text(content)
-                
-                blocks.append({
-                    "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
-                        "rich_text": rich_text
-                    }
-                })
+            elif first == '-':
+                if line.startswith('- '):
+                    block_type = "bulleted_list_item"
+                    text = line[2:]
             
             # Handle numbered lists
-            elif re.match(r'^\d+\. ', line):
-                content = re.sub(r'^\d+\. ', '', line)
-                rich_text = self._parse_rich_text(content)
-                
-                blocks.append({
-                    "object": "block",
-                    "type": "numbered_list_item",
-                    "numbered_list_item": {
-                        "rich_text": rich_text
-                    }
-                })
+            elif first.isdigit():
+                numbered = _NUMBERED_RE.match(line)
+                if numbered:
+                    block_type = "numbered_list_item"
+                    text = line[numbered.end():]
             
-            # Handle regular text
-            else:
-                rich_text = self._parse_rich_text(line)
-                blocks.append({
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": rich_text
-                    }
-                })
+            blocks.append(_make_block(block_type, self._parse_rich_text(text)))
+            
+            if block_type == "heading_2":
+                # Remove emojis and clean up
+                category = _NON_CATEGORY_RE.sub('', text).strip()
+                if category:
+                    categories.append(category)
         
-        return blocks
+        return blocks, categories
     
     def _parse_rich_text(self, text: str) -> List[Dict[str, Any]]:
         """
@@ -325,17 +772,21 @@ class NotionIntegration:
         Returns:
             List of rich text objects
         """
+        # Plain text needs no regex scanning
+        if '*' not in text and '[' not in text:
+            return [_text_item(text)] if text else []
+        
         rich_text = []
         current_pos = 0
         
         # Handle links first (they can contain other formatting)
         while True:
-            link_match = re.search(r'\[([^\]]+)\]\(([^)]+)\)', text[current_pos:])
+            link_match = _LINK_RE.search(text, current_pos)
             if not link_match:
                 break
             
-            link_start = current_pos + link_match.start()
-            link_end = current_pos + link_match.end()
+            link_start = link_match.start()
+            link_end = link_match.end()
             
             # Add text before the link
             if link_start > current_pos:
@@ -345,12 +796,7 @@ class NotionIntegration:
             # Add the link
             link_text = link_match.group(1)
             link_url = link_match.group(2)
-            rich_text.append({
-                "text": {
-                    "content": link_text,
-                    "link": {"url": link_url}
-                }
-            })
+            rich_text.append(_text_item(link_text, link={"url": link_url}))
             
             current_pos = link_end
         
@@ -379,12 +825,12 @@ class NotionIntegration:
         
         # Handle bold text (**text**)
         while True:
-            bold_match = re.search(r'\*\*([^*]+)\*\*', text[current_pos:])
+            bold_match = _BOLD_RE.search(text, current_pos)
             if not bold_match:
                 break
             
-            bold_start = current_pos + bold_match.start()
-            bold_end = current_pos + bold_match.end()
+            bold_start = bold_match.start()
+            bold_end = bold_match.end()
             
             # Add text before the bold
             if bold_start > current_pos:
@@ -393,14 +839,7 @@ class NotionIntegration:
             
             # Add the bold text
             bold_content = bold_match.group(1)
-            rich_text.append({
-                "text": {
-                    "content": bold_content
-                },
-                "annotations": {
-                    "bold": True
-                }
-            })
+            rich_text.append(_text_item(bold_content, annotations=_BOLD))
             
             current_pos = bold_end
         
@@ -429,43 +868,28 @@ class NotionIntegration:
         
         # Handle italic text (*text*)
         while True:
-            italic_match = re.search(r'\*([^*]+)\*', text[current_pos:])
+            italic_match = _ITALIC_RE.search(text, current_pos)
             if not italic_match:
                 break
             
-            italic_start = current_pos + italic_match.start()
-            italic_end = current_pos + italic_match.end()
+            italic_start = italic_match.start()
+            italic_end = italic_match.end()
             
             # Add text before the italic
             if italic_start > current_pos:
                 before_text = text[current_pos:italic_start]
-                rich_text.append({
-                    "text": {
-                        "content": before_text
-                    }
-                })
+                rich_text.append(_text_item(before_text))
             
             # Add the italic text
             italic_content = italic_match.group(1)
-            rich_text.append({
-                "text": {
-                    "content": italic_content
-                },
-                "annotations": {
-                    "italic": True
-                }
-            })
+            rich_text.append(_text_item(italic_content, annotations=_ITALIC))
             
             current_pos = italic_end
         
         # Add remaining text
         if current_pos < len(text):
             remaining_text = text[current_pos:]
-            rich_text.append({
-                "text": {
-                    "content": remaining_text
-                }
-            })
+            rich_text.append(_text_item(remaining_text))
         
         return rich_text
     
@@ -479,35 +903,81 @@ class NotionIntegration:
         Returns:
             List of category names
         """
-        categories = []
-        lines = markdown_content.split('\n')
-        
-        for line in lines:
-            if line.startswith('## '):
-                category = line[3:].strip()
-                # Remove emojis and clean up
-                category = re.sub(r'[^\w\s-]', '', category).strip()
-                if category:
-                    categories.append(category)
-        
-        return categories
+        return self._parse_markdown(markdown_content)[1]
     
     def _get_database_schema(self, database_id: str) -> dict:
         """
         Get the schema/properties of a database
         
+        Schemas rarely change, so they are cached per database for
+        SCHEMA_CACHE_TTL seconds.
+        
         Args:
             database_id: Notion database ID
             
         Returns:
             Dictionary of database properties
         """
+        entry = self._get_schema_entry(database_id)
+        return entry[1] if entry else {}
+    
+    def _get_property_writers(self, database_id: str) -> Dict[str, PropertyWriter]:
+        """
+        Get the builders for the optional properties a database can accept
+        
+        The builders are picked from _PROPERTY_BUILDERS by each property's
+        type once per cached schema, so page creation doesn't re-inspect it.
+        
+        Args:
+            database_id: Notion database ID
+            
+        Returns:
+            Dictionary mapping property name to its value builder
+        """
+        entry = self._get_schema_entry(database_id)
+        return entry[2] if entry else {}
+    
+    def _get_schema_entry(self, database_id: str) -> Optional[Tuple[float, dict, Dict[str, PropertyWriter]]]:
+        """
+        Get the cached (retrieved at, properties, writers) entry for a database
+        
+        Args:
+            database_id: Notion database ID
+            
+        Returns:
+            Cache entry, or None if the schema could not be retrieved
+        """
+        cached = self._schema_cache.get(database_id)
+        if cached and time.monotonic() - cached[0] < self._schema_ttl:
+            return cached
+        
         try:
             database = self.client.databases.retrieve(database_id=database_id)
-            return database.get('properties', {})
+            properties = database.get('properties', {})
+            writers = {
+                name: _PROPERTY_BUILDERS[name][prop.get('type')]
+                for name, prop in properties.items()
+                if prop.get('type') in _PROPERTY_BUILDERS.get(name, {})
+            }
+            entry = (time.monotonic(), properties, writers)
+            self._schema_cache[database_id] = entry
+            return entry
         except Exception as e:
             print(f"Warning: Could not retrieve database schema: {e}")
-            return {}
+            return None
+    
+    def invalidate_schema(self, database_id: str) -> None:
+        """
+        Drop the cached schema for a database so the next lookup refetches it
+        
+        Args:
+            database_id: Notion database ID
+        """
+        self._schema_cache.pop(database_id, None)
+    
+    def schema_cache_clear(self) -> None:
+        """Drop every cached database schema, e.g. between test runs"""
+        self._schema_cache.clear()
     
     def _get_page_properties(self, page_id: str) -> dict:
         """
@@ -530,21 +1000,36 @@ class NotionIntegration:
         """
         Get list of available databases
         
+        Every page of search results is collected, following cursors in
+        order since each page's cursor comes from the previous response. The
+        result is cached for DATABASES_CACHE_TTL seconds since search is one
+        of Notion's slowest endpoints.
+        
         Returns:
             List of database objects
         """
+        if self._databases_cache and time.monotonic() - self._databases_cache[0] < DATABASES_CACHE_TTL:
+            return self._databases_cache[1]
+        
         try:
-            response = self.client.search(
+            databases = collect_paginated_api(
+                self.client.search,
                 filter={
                     "property": "object",
                     "value": "database"
-                }
+                },
+                page_size=NOTION_PAGE_SIZE
             )
-            return response["results"]
+            self._databases_cache = (time.monotonic(), databases)
+            return databases
         except Exception as e:
             print(f"Warning: Failed to get databases: {str(e)}")
             return []
     
+    def invalidate_databases_cache(self) -> None:
+        """Forget the cached database list so the next get_databases call searches again"""
+        self._databases_cache = None
+    
     def get_pages(self, database_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Get list of pages from a database
@@ -573,10 +1058,15 @@ class NotionIntegration:
             print(f"Warning: Failed to get pages: {str(e)}")
             return []
 
+@functools.lru_cache(maxsize=1)
+def get_shared() -> NotionIntegration:
+    """Return a NotionIntegration shared by the whole process, created on first use"""
+    return NotionIntegration()
+
 def test_notion_connection():
     """Test Notion API connection"""
     try:
-        notion = NotionIntegration()
+        notion = get_shared()
         databases = notion.get_databases()
         print(f"✅ Notion connection successful! Found {len(databases)} databases.")
         return True
@@ -1,19 +1,25 @@
 #!/usr/bin/env python3
 """
 Automated Release Notes Scheduler
-This script runs the release notes generation automatically on a daily basis.
+This script generates release notes for recent releases in a single run.
+Schedule it daily with cron, a systemd timer or GitHub Actions.
 """
 
-import schedule
 import time
 import os
+import re
 import sys
 import logging
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import hashlib
+import orjson
 
 # Load environment variables
 load_dotenv()
@@ -71,133 +77,324 @@ DOMAIN_AREAS = [
 
 EXCLUDED_STATUSES = ["Canceled", "Cancelled", "Duplicate"]
 
+# Release labels follow a version pattern like X.Y.Z
+_RELEASE_RE = re.compile(r'^\d+\.\d+\.\d+$')
+
+# Set views of DOMAIN_AREAS and EXCLUDED_STATUSES for constant-time lookups
+_DOMAIN_AREA_SET = frozenset(DOMAIN_AREAS)
+_EXCLUDED = frozenset(EXCLUDED_STATUSES)
+
+# Order of the category sections in the release notes
+_CATEGORY_ORDER = list(CATEGORY_MAPPINGS.values()) + ["Other Changes"]
+
+# Row templates for an issue line in the release notes, with and without a domain area
+_FMT_DOMAIN = "- {emoji} **{title}** ([{ident}]({url})) [{dom}]\n"
+_FMT_NODOM = "- {emoji} **{title}** ([{ident}]({url}))\n"
+
+# The only issue labels release notes care about; queries fetch just these
+CLASSIFIER_LABELS = list(CATEGORY_MAPPINGS) + DOMAIN_AREAS
+
+# Linear rejects any query scoring over 10,000 complexity points. A connection
+# scores its page size times the cost of each node (50 nodes if no `first` is
+# given), so every nested connection is bounded and page sizes are derived
+# from a budget kept below the limit to leave room for the estimate
+LINEAR_QUERY_BUDGET = 8000
+
+# Estimated points per issue selected in release queries: the issue, its state
+# and a labels connection of at most len(CLASSIFIER_LABELS) nodes
+ISSUE_COMPLEXITY = 3 + 1.1 * len(CLASSIFIER_LABELS)
+
+# Page sizes for paginated Linear queries (Linear allows at most 250)
+ISSUES_PAGE_SIZE = min(250, int(LINEAR_QUERY_BUDGET // ISSUE_COMPLEXITY))
+LABELS_PAGE_SIZE = 100
+
+# Batched issue queries repeat the issue selection once per release label, so
+# each alias asks for a smaller first page and the batch is sized to fit the
+# budget; labels with more issues page through the rest individually
+BATCH_ISSUES_PAGE_SIZE = 50
+ISSUE_BATCH_SIZE = max(1, int(LINEAR_QUERY_BUDGET // (BATCH_ISSUES_PAGE_SIZE * ISSUE_COMPLEXITY)))
+
+# Upper bound on simultaneous requests to the Linear API
+MAX_CONCURRENT_REQUESTS = 10
+
+# Seconds to wait for a Linear API response
+REQUEST_TIMEOUT = 30
+
+# Local cache for data that rarely changes between runs
+CACHE_DIR = os.path.join('releases', '.cache')
+LABELS_CACHE_FILE = os.path.join(CACHE_DIR, 'labels_cache.json')
+LABELS_CACHE_TTL = 3600  # seconds
+
+# One keep-alive session for every Linear request, sized for the fetch pool
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=MAX_CONCURRENT_REQUESTS))
+_SESSION.headers.update({
+    'Authorization': LINEAR_API_KEY,
+    'Content-Type': 'application/json',
+})
+
 def make_linear_request(query, variables=None):
     """Make a request to Linear API"""
-    headers = {
-        'Authorization': LINEAR_API_KEY,
-        'Content-Type': 'application/json',
-    }
-    
     payload = {
         'query': query,
         'variables': variables or {}
     }
     
-    response = requests.post(LINEAR_API_URL, json=payload, headers=headers)
-    return response.json()
+    response = _SESSION.post(LINEAR_API_URL, data=orjson.dumps(payload), timeout=REQUEST_TIMEOUT)
+    return orjson.loads(response.content)
+
+def fetch_all_nodes(query, variables, path, after=None):
+    """Collect every node of a paginated connection, starting after cursor `after`
+    
+    `query` must accept an `$after: String` variable and select
+    `pageInfo { hasNextPage endCursor }` on the connection found by following
+    `path` (a sequence of keys) under `data`.
+    
+    Returns (nodes, errors); errors is the GraphQL error list that stopped
+    pagination, or None.
+    """
+    variables = dict(variables or {})
+    variables['after'] = after
+    nodes = []
+    
+    while True:
+        result = make_linear_request(query, variables)
+        if 'errors' in result:
+            return nodes, result['errors']
+        
+        connection = result.get('data') or {}
+        for key in path:
+            connection = connection.get(key) or {}
+        nodes.extend(connection.get('nodes', []))
+        
+        page_info = connection.get('pageInfo') or {}
+        if not page_info.get('hasNextPage'):
+            return nodes, None
+        variables['after'] = page_info.get('endCursor')
+
+def _load_cached_labels():
+    """Return cached label nodes if the cache is younger than LABELS_CACHE_TTL"""
+    try:
+        if time.time() - os.path.getmtime(LABELS_CACHE_FILE) >= LABELS_CACHE_TTL:
+            return None
+        with open(LABELS_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)['labels']
+    except (OSError, ValueError, KeyError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logging.warning(f"Ignoring unreadable labels cache: {e}")
+        return None
+
+def _store_cached_labels(labels):
+    """Persist label nodes, rewriting the cache file only when their content changed"""
+    labels_hash = hashlib.sha256(json.dumps(labels, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    try:
+        try:
+            with open(LABELS_CACHE_FILE, 'r', encoding='utf-8') as f:
+                cached_hash = json.load(f).get('hash')
+        except (OSError, ValueError):
+            cached_hash = None
+        
+        if cached_hash == labels_hash:
+            # Same labels as last time; just mark the cache as fresh again
+            os.utime(LABELS_CACHE_FILE)
+            return
+        
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(LABELS_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'hash': labels_hash, 'labels': labels}, f)
+    except OSError as e:
+        logging.warning(f"Could not write labels cache: {e}")
 
 def get_recent_releases():
     """Get recent release labels (last 30 days)"""
-    query = """
-    query {
-        viewer {
-            organization {
-                labels {
-                    nodes {
-                        name
-                        createdAt
+    labels = _load_cached_labels()
+    
+    if labels is None:
+        query = """
+        query Labels($after: String) {
+            viewer {
+                organization {
+                    labels(first: %d, after: $after) {
+                        pageInfo {
+                            hasNextPage
+                            endCursor
+                        }
+                        nodes {
+                            name
+                            createdAt
+                        }
                     }
                 }
             }
         }
-    }
-    """
-    
-    result = make_linear_request(query)
-    if 'errors' in result:
-        logging.error(f"Error fetching labels: {result['errors']}")
-        return []
-    
-    labels = result.get('data', {}).get('viewer', {}).get('organization', {}).get('labels', {}).get('nodes', [])
+        """ % LABELS_PAGE_SIZE
+        
+        labels, errors = fetch_all_nodes(query, None, ('viewer', 'organization', 'labels'))
+        if errors:
+            logging.error(f"Error fetching labels: {errors}")
+            return []
+        
+        _store_cached_labels(labels)
+    else:
+        logging.info("Using cached label list")
     
-    # Filter for release labels (assuming they follow a version pattern like X.Y.Z)
-    import re
-    release_pattern = re.compile(r'^\d+\.\d+\.\d+$')
-    release_labels = [label['name'] for label in labels if release_pattern.match(label['name'])]
+    # Filter for release labels
+    release_labels = [label['name'] for label in labels if _RELEASE_RE.match(label['name'])]
     
     return release_labels
 
-def get_issues_by_label(release_label):
-    """Fetch issues by release label"""
-    query = """
-    query IssuesByReleaseLabel($releaseLabel: String!) {
-        issues(filter: {
-            labels: { name: { eq: $releaseLabel } },
-            parent: { null: true }
-        }) {
-            nodes {
+# Fields selected for each issue in release queries; queries using them must
+# declare $classifierLabels
+_ISSUE_FIELDS = """
                 identifier
                 title
                 url
                 state {
                     name
                 }
-                labels {
+                labels(first: %d, filter: { name: { in: $classifierLabels } }) {
                     nodes {
                         name
                     }
                 }
+""" % len(CLASSIFIER_LABELS)
+
+def get_issues_by_label(release_label, after=None):
+    """Fetch issues by release label, optionally resuming from a page cursor"""
+    query = """
+    query IssuesByReleaseLabel($releaseLabel: String!, $classifierLabels: [String!], $after: String) {
+        issues(first: %d, after: $after, filter: {
+            labels: { name: { eq: $releaseLabel } },
+            parent: { null: true }
+        }) {
+            pageInfo {
+                hasNextPage
+                endCursor
             }
+            nodes {%s            }
         }
     }
-    """
+    """ % (ISSUES_PAGE_SIZE, _ISSUE_FIELDS)
     
-    result = make_linear_request(query, {'releaseLabel': release_label})
-    if 'errors' in result:
-        logging.error(f"Error fetching issues: {result['errors']}")
+    variables = {'releaseLabel': release_label, 'classifierLabels': CLASSIFIER_LABELS}
+    issues, errors = fetch_all_nodes(query, variables, ('issues',), after=after)
+    if errors:
+        logging.error(f"Error fetching issues: {errors}")
         return []
     
-    return result.get('data', {}).get('issues', {}).get('nodes', [])
+    return issues
 
-def determine_category(issue):
-    """Determine category based on issue labels"""
-    issue_labels = [label['name'] for label in issue['labels']['nodes']]
+def _build_batched_issues_query(count):
+    """Build one query fetching the first page of issues for `count` labels, aliased r0..r{count-1}"""
+    declarations = ", ".join([f"$l{i}: String!" for i in range(count)] + ["$classifierLabels: [String!]"])
+    selections = "".join(
+        f"""
+        r{i}: issues(first: {BATCH_ISSUES_PAGE_SIZE}, filter: {{
+            labels: {{ name: {{ eq: $l{i} }} }},
+            parent: {{ null: true }}
+        }}) {{
+            pageInfo {{
+                hasNextPage
+                endCursor
+            }}
+            nodes {{{_ISSUE_FIELDS}            }}
+        }}"""
+        for i in range(count)
+    )
+    return f"""
+    query IssuesByReleaseLabels({declarations}) {{{selections}
+    }}
+    """
+
+def _fetch_issue_batch(release_labels):
+    """Fetch issues for a batch of release labels in a single request
+    
+    Labels with more than one page of issues get their remaining pages
+    fetched individually, as do labels whose alias failed. A GraphQL error
+    only affects the alias its path starts with; errors without a path
+    affect the whole batch.
+    """
+    query = _build_batched_issues_query(len(release_labels))
+    variables = {f"l{i}": label for i, label in enumerate(release_labels)}
+    variables['classifierLabels'] = CLASSIFIER_LABELS
     
-    for label in issue_labels:
-        if label in CATEGORY_MAPPINGS:
-            return CATEGORY_MAPPINGS[label]
+    result = make_linear_request(query, variables)
+    errors = result.get('errors') or []
+    failed_aliases = {(error.get('path') or [None])[0] for error in errors}
+    if errors:
+        logging.error(f"Error fetching issues, refetching affected labels individually: {errors}")
     
-    return "Other Changes"
+    data = result.get('data') or {}
+    issues_by_label = {}
+    for i, label in enumerate(release_labels):
+        alias = f"r{i}"
+        connection = data.get(alias)
+        if connection is None or alias in failed_aliases or None in failed_aliases:
+            issues_by_label[label] = get_issues_by_label(label)
+            continue
+        
+        issues = connection.get('nodes', [])
+        page_info = connection.get('pageInfo') or {}
+        if page_info.get('hasNextPage'):
+            issues = issues + get_issues_by_label(label, after=page_info.get('endCursor'))
+        issues_by_label[label] = issues
+    return issues_by_label
 
-def find_domain_area(issue):
-    """Find domain area from issue labels"""
-    issue_labels = [label['name'] for label in issue['labels']['nodes']]
+def get_issues_for_labels_batched(release_labels, batch_size=ISSUE_BATCH_SIZE):
+    """Fetch issues for many release labels, up to batch_size labels per request
     
-    for label in issue_labels:
-        if label in DOMAIN_AREAS:
-            return label
+    Each batch is one GraphQL request with an aliased issues query per label.
+    Batches run concurrently. Returns a dict mapping each release label to its
+    list of issues.
+    """
+    batches = [release_labels[i:i + batch_size] for i in range(0, len(release_labels), batch_size)]
+    if not batches:
+        return {}
     
-    return None
+    issues_by_label = {}
+    workers = min(MAX_CONCURRENT_REQUESTS, len(batches))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch_result in executor.map(_fetch_issue_batch, batches):
+            issues_by_label.update(batch_result)
+    return issues_by_label
 
-def get_status_emoji(issue):
-    """Get status emoji for an issue"""
-    state_name = issue['state']['name']
-    return STATUS_EMOJIS.get(state_name, "")
-
-def should_exclude_issue(issue):
-    """Check if issue should be excluded"""
-    state_name = issue['state']['name']
-    return state_name in EXCLUDED_STATUSES
+def classify_issue(issue):
+    """Determine category and domain area from issue labels in one pass
+    
+    For each, the first matching label in the issue's label order wins.
+    Returns a (category, domain_area) tuple; domain_area may be None.
+    """
+    category = None
+    domain_area = None
+    
+    for label in issue['labels']['nodes']:
+        name = label['name']
+        if category is None and name in CATEGORY_MAPPINGS:
+            category = CATEGORY_MAPPINGS[name]
+        if domain_area is None and name in _DOMAIN_AREA_SET:
+            domain_area = name
+        if category is not None and domain_area is not None:
+            break
+    
+    return category or "Other Changes", domain_area
 
-def generate_release_notes(issues, release_version):
-    """Generate release notes markdown"""
+def generate_release_notes_iter(issues, release_version):
+    """Generate release notes markdown as a sequence of text chunks"""
     if not issues:
-        return "No issues found for this release."
+        yield "No issues found for this release."
+        return
     
     # Filter out excluded issues
-    filtered_issues = [issue for issue in issues if not should_exclude_issue(issue)]
+    filtered_issues = [issue for issue in issues if issue['state']['name'] not in _EXCLUDED]
     
     # Group issues by category
-    categorized_issues = {}
-    for category in CATEGORY_MAPPINGS.values():
-        categorized_issues[category] = []
-    categorized_issues["Other Changes"] = []
+    categorized_issues = defaultdict(list)
     
     # Categorize issues
     for issue in filtered_issues:
-        category = determine_category(issue)
-        domain_area = find_domain_area(issue)
-        status_emoji = get_status_emoji(issue)
+        category, domain_area = classify_issue(issue)
+        status_emoji = STATUS_EMOJIS.get(issue['state']['name'], "")
         
         categorized_issues[category].append({
             'title': issue['title'],
@@ -208,39 +405,92 @@ def generate_release_notes(issues, release_version):
         })
     
     # Generate markdown
-    markdown = f"# 🚀 Changelog - {release_version}\n\n"
-    markdown += f"*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n\n"
+    yield f"# 🚀 Changelog - {release_version}\n\n"
+    yield f"*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n\n"
     
-    for category, issues_list in categorized_issues.items():
+    for category in _CATEGORY_ORDER:
+        issues_list = categorized_issues.get(category)
         if issues_list:
-            markdown += f"## {category}\n\n"
+            yield f"## {category}\n\n"
             
             for issue in issues_list:
-                markdown += f"- {issue['status_emoji']} **{issue['title']}** ([{issue['identifier']}]({issue['url']}))"
-                if issue['domain_area']:
-                    markdown += f" [{issue['domain_area']}]"
-                markdown += "\n"
+                dom = issue['domain_area']
+                yield (_FMT_DOMAIN if dom else _FMT_NODOM).format(
+                    emoji=issue['status_emoji'], title=issue['title'],
+                    ident=issue['identifier'], url=issue['url'], dom=dom
+                )
             
-            markdown += "\n"
-    
-    return markdown
+            yield "\n"
+
+def generate_release_notes(issues, release_version):
+    """Generate release notes markdown"""
+    return "".join(generate_release_notes_iter(issues, release_version))
+
+def issue_set_key(issues):
+    """Content hash of the parts of an issue set that appear in the release notes"""
+    entries = sorted(
+        (
+            issue['identifier'],
+            issue['title'],
+            issue.get('url') or '',
+            issue['state']['name'],
+            sorted(label['name'] for label in issue['labels']['nodes'])
+        )
+        for issue in issues
+    )
+    return hashlib.sha256(json.dumps(entries).encode('utf-8')).hexdigest()
+
+def _key_path(release_version):
+    """Sidecar file holding the issue-set key for a release"""
+    return os.path.join(CACHE_DIR, f"{release_version}.key")
+
+def read_issue_set_key(release_version):
+    """Return the issue-set key stored for the last saved notes of a release"""
+    try:
+        with open(_key_path(release_version), 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def write_issue_set_key(release_version, key):
+    """Remember the issue-set key the saved notes of a release were built from"""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(_key_path(release_version), 'w', encoding='utf-8') as f:
+            f.write(key)
+    except OSError as e:
+        logging.warning(f"Could not write cache key for {release_version}: {e}")
+
+def changelog_path(release_version):
+    """Path of the saved changelog for a release"""
+    return os.path.join('releases', f"changelog-{release_version}.md")
 
 def save_release_notes(release_version, content):
     """Save release notes to file"""
-    filename = f"changelog-{release_version}.md"
+    return save_release_notes_stream(release_version, [content])
+
+def save_release_notes_stream(release_version, chunks):
+    """Save release notes to file, writing chunks as they are produced
     
+    Chunks go to a temporary file that replaces the changelog only once
+    everything has been written, so a failure never leaves a partial file.
+    """
     # Create releases directory if it doesn't exist
     os.makedirs('releases', exist_ok=True)
     
-    filepath = os.path.join('releases', filename)
+    filepath = changelog_path(release_version)
+    tmp_path = filepath + '.tmp'
     
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(chunks)
+        os.replace(tmp_path, filepath)
         logging.info(f"Release notes saved to {filepath}")
         return filepath
     except Exception as e:
         logging.error(f"Error saving release notes: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
         return None
 
 def generate_daily_release_notes():
@@ -261,40 +511,51 @@ def generate_daily_release_notes():
         
         logging.info(f"Found {len(release_labels)} release labels: {release_labels}")
         
-        # Generate release notes for each release
+        # Drop releases whose notes were already written today before any network I/O
+        today = datetime.now().date()
+        pending_labels = []
         for release_label in release_labels:
+            filepath = changelog_path(release_label)
+            if os.path.exists(filepath) and datetime.fromtimestamp(os.path.getmtime(filepath)).date() == today:
+                logging.info(f"Release notes for {release_label} already generated today, skipping...")
+            else:
+                pending_labels.append(release_label)
+        
+        # Fetch issues for the remaining releases up front, several labels per request
+        issues_by_label = get_issues_for_labels_batched(pending_labels)
+        
+        cache_hits = 0
+        
+        # Generate release notes for each release
+        for release_label in pending_labels:
             logging.info(f"Processing release {release_label}...")
             
-            # Check if we already have recent release notes for this version
-            filename = f"changelog-{release_label}.md"
-            filepath = os.path.join('releases', filename)
-            
-            if os.path.exists(filepath):
-                # Check if file was updated today
-                file_mtime = datetime.fromtimestamp(os.path.getmtime(filepath))
-                if file_mtime.date() == datetime.now().date():
-                    logging.info(f"Release notes for {release_label} already generated today, skipping...")
-                    continue
-            
-            # Fetch issues for this release
-            issues = get_issues_by_label(release_label)
+            filepath = changelog_path(release_label)
+            issues = issues_by_label[release_label]
             
             if issues:
                 logging.info(f"Found {len(issues)} issues for release {release_label}")
                 
-                # Generate release notes
-                release_notes = generate_release_notes(issues, release_label)
+                # Skip regeneration when the issue set matches the one behind the saved file
+                key = issue_set_key(issues)
+                if os.path.exists(filepath) and read_issue_set_key(release_label) == key:
+                    cache_hits += 1
+                    logging.info(f"Issues for {release_label} unchanged (cache hit), skipping...")
+                    continue
                 
-                # Save to file
-                saved_path = save_release_notes(release_label, release_notes)
+                # Generate release notes straight into the file
+                release_notes = generate_release_notes_iter(issues, release_label)
+                saved_path = save_release_notes_stream(release_label, release_notes)
                 
                 if saved_path:
+                    write_issue_set_key(release_label, key)
                     logging.info(f"Successfully generated release notes for {release_label}")
                 else:
                     logging.error(f"Failed to save release notes for {release_label}")
             else:
                 logging.info(f"No issues found for release {release_label}")
         
+        logging.info(f"Release notes cache hits: {cache_hits}/{len(pending_labels)}")
         logging.info("Daily release notes generation completed")
         
     except Exception as e:
@@ -304,37 +565,21 @@ def main():
     """Main function to run the scheduler"""
     parser = argparse.ArgumentParser(description='Release Notes Scheduler')
     parser.add_argument('--run-once', action='store_true', 
-                       help='Run once and exit (useful for CI/CD)')
+                       help='Run once and exit (the only supported mode)')
     
     args = parser.parse_args()
     
-    logging.info("Starting Release Notes Scheduler...")
-    
-    if args.run_once:
-        # Run once and exit
-        logging.info("Running release notes generation once...")
-        generate_daily_release_notes()
-        logging.info("Completed single run.")
-        return
-    
-    # Schedule the job to run daily at 9 AM
-    schedule.every().day.at("09:00").do(generate_daily_release_notes)
+    if not args.run_once:
+        # The built-in daily loop has been removed; scheduling is left to the OS
+        logging.warning(
+            "Running without --run-once is deprecated: the scheduler no longer stays "
+            "running. Schedule 'python scheduler.py --run-once' with cron or a systemd "
+            "timer instead (see README). Running once now."
+        )
     
-    # Also run immediately on startup
-    logging.info("Running initial release notes generation...")
+    logging.info("Running release notes generation once...")
     generate_daily_release_notes()
-    
-    logging.info("Scheduler started. Will run daily at 9:00 AM.")
-    logging.info("Press Ctrl+C to stop the scheduler.")
-    
-    try:
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
-    except KeyboardInterrupt:
-        logging.info("Scheduler stopped by user")
-    except Exception as e:
-        logging.error(f"Scheduler error: {e}")
+    logging.info("Completed single run.")
 
 if __name__ == "__main__":
     main()
@@ -4,7 +4,9 @@ Password setup script for Linear Release Notes Generator
 """
 
 import os
+import re
 import getpass
+from pathlib import Path
 from dotenv import load_dotenv
 
 def setup_password():
@@ -51,25 +53,23 @@ def setup_password():
         
         break
     
-    # Update .env file
-    env_lines = []
-    password_updated = False
+    # Update .env file in one pass, replacing any existing APP_PASSWORD line
+    env_path = Path(env_file)
+    text = env_path.read_text() if env_path.exists() else ""
+    # The replacement is a function so backslashes in the password are kept literally
+    text, replaced = re.subn(r'^APP_PASSWORD=.*$', lambda _: f'APP_PASSWORD={password}', text, flags=re.M)
     
-    if os.path.exists(env_file):
-        with open(env_file, 'r') as f:
-            for line in f:
-                if line.startswith('APP_PASSWORD='):
-                    env_lines.append(f'APP_PASSWORD={password}\n')
-                    password_updated = True
-                else:
-                    env_lines.append(line)
-    
-    if not password_updated:
-        env_lines.append(f'APP_PASSWORD={password}\n')
+    if not replaced:
+        if text and not text.endswith('\n'):
+            text += '\n'
+        text += f'APP_PASSWORD={password}\n'
     
-    # Write back to .env file
-    with open(env_file, 'w') as f:
-        f.writelines(env_lines)
+    # Write to a temporary file and swap it in so .env is never left half-written
+    tmp_path = Path(env_file + '.tmp')
+    tmp_path.write_text(text)
+    if env_path.exists():
+        os.chmod(tmp_path, env_path.stat().st_mode)
+    os.replace(tmp_path, env_path)
     
     print(f"\n✅ Password updated successfully!")
     print(f"📁 Password stored in {env_file}")
@@ -3,20 +3,205 @@
 Test script to verify Linear API connection and configuration
 """
 
-import os
+import re
+import sys
+import time
+import orjson
 import requests
-from dotenv import load_dotenv
-import re # Added for regex matching in test_release_labels
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from functools import lru_cache
+from env_bootstrap import ensure_loaded
+from config import settings
 
 # Load environment variables
-load_dotenv()
+ensure_loaded()
+
+LINEAR_API_URL = 'https://api.linear.app/graphql'
+
+# (connect, read) timeouts in seconds for Linear API calls
+REQUEST_TIMEOUT = (3.05, 10)
+
+# Longest we will wait for a rate limit to reset before retrying
+MAX_RATE_LIMIT_WAIT = 60
+
+class _LinearRetry(Retry):
+    """Retry that falls back to Linear's rate-limit reset header when a 429 has no Retry-After"""
+    
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, MAX_RATE_LIMIT_WAIT)
+        
+        # Linear sends the reset header on every response, so only honour it
+        # when rate limited; other statuses use the exponential backoff
+        if response.status != 429:
+            return None
+        
+        # Linear reports the reset time as epoch milliseconds
+        reset = response.headers.get('X-RateLimit-Requests-Reset')
+        try:
+            return min(max(0.0, int(reset) / 1000 - time.time()), MAX_RATE_LIMIT_WAIT)
+        except (TypeError, ValueError):
+            return None
+
+# One keep-alive session shared by all probes; retries transient failures
+# (including the POSTs GraphQL uses) with exponential backoff
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    max_retries=_LinearRetry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'POST']),
+        respect_retry_after_header=True
+    )
+))
+SESSION.headers.update({
+    'Authorization': settings().linear_api_key,
+    'Content-Type': 'application/json',
+})
+
+# Release labels to request; the probe only needs to show that some exist
+RELEASE_LABELS_PAGE_SIZE = 100
+
+# Labels outside the "Release" group (top-level or under any other parent)
+# also count as release labels when they start with a version number
+_RELEASE_RE = re.compile(r'^\d+\.\d+\.\d+')
+_VERSION_LABELS_FILTER = '{ or: [{ parent: { null: true } }, { parent: { name: { neq: "Release" } } }] }'
+
+# Teams to request; the tests print at most this many names
+TEAMS_PAGE_SIZE = 5
+
+# Every probe in one document, so the whole connection test is a single request
+PROBE_QUERY = """
+query {
+    viewer {
+        id
+        name
+        email
+        organization {
+            id
+            name
+            teams(first: %d) {
+                pageInfo {
+                    hasNextPage
+                }
+                nodes {
+                    name
+                }
+            }
+            labels(first: %d, filter: { parent: { name: { eq: "Release" } } }) {
+                pageInfo {
+                    hasNextPage
+                }
+                nodes {
+                    name
+                }
+            }
+            versionLabels: labels(first: %d, filter: %s) {
+                pageInfo {
+                    hasNextPage
+                    endCursor
+                }
+                nodes {
+                    name
+                }
+            }
+        }
+    }
+}
+""" % (TEAMS_PAGE_SIZE, RELEASE_LABELS_PAGE_SIZE, RELEASE_LABELS_PAGE_SIZE, _VERSION_LABELS_FILTER)
+
+# Further pages of non-Release labels, for when the probe's first page has no version labels
+VERSION_LABELS_QUERY = """
+query VersionLabels($after: String) {
+    viewer {
+        organization {
+            labels(first: %d, after: $after, filter: %s) {
+                pageInfo {
+                    hasNextPage
+                    endCursor
+                }
+                nodes {
+                    name
+                }
+            }
+        }
+    }
+}
+""" % (RELEASE_LABELS_PAGE_SIZE, _VERSION_LABELS_FILTER)
+
+# The probe request body never changes, so serialise it once at import
+_PROBE_BODY = orjson.dumps({'query': PROBE_QUERY})
+
+def run_query(body):
+    """POST a pre-encoded GraphQL request body to Linear and return the decoded response"""
+    response = SESSION.post(LINEAR_API_URL, data=body, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    try:
+        return orjson.loads(response.content)
+    except ValueError as e:
+        # Keep reporting undecodable bodies through the tests' RequestException handlers
+        raise requests.exceptions.InvalidJSONError(str(e), response=response)
+
+@lru_cache(maxsize=1)
+def fetch_probes():
+    """Send PROBE_QUERY once per run and return the decoded response"""
+    return run_query(_PROBE_BODY)
+
+# Where each probe section's data sits in the combined response
+_SECTION_PATHS = [
+    ('viewer', ['viewer']),
+    ('organization', ['viewer', 'organization']),
+    ('teams', ['viewer', 'organization', 'teams']),
+    ('labels', ['viewer', 'organization', 'labels']),
+    ('labels', ['viewer', 'organization', 'versionLabels']),
+]
+
+def _error_sections(error):
+    """Name the probe sections a GraphQL error affects, from its path
+    
+    That is the deepest section the error was raised under, plus every section
+    nested inside the failed field, since their data was lost with it. Errors
+    without a path affect every section.
+    """
+    path = error.get('path') or []
+    owner = max(
+        ((section, section_path) for section, section_path in _SECTION_PATHS if path[:len(section_path)] == section_path),
+        key=lambda entry: len(entry[1]),
+        default=('viewer', None)
+    )[0]
+    nested = {section for section, section_path in _SECTION_PATHS if section_path[:len(path)] == path}
+    return nested | {owner}
+
+def probe_result(section):
+    """Return the slice of the combined probe response that one test checks
+    
+    The slice keeps the response shape each test's original standalone query
+    had, and carries only the GraphQL errors raised under that section
+    ('viewer', 'organization', 'teams' or 'labels'), including errors on an
+    enclosing field that left the section's data null.
+    """
+    response = fetch_probes()
+    data = response.get('data') or {}
+    if section == 'organization':
+        data = {'organization': (data.get('viewer') or {}).get('organization')}
+    
+    result = {'data': data}
+    errors = [error for error in response.get('errors') or [] if section in _error_sections(error)]
+    if errors:
+        result['errors'] = errors
+    return result
 
 def test_linear_connection():
     """Test Linear API connection"""
     print("🔍 Testing Linear API connection...")
     
     # Check if API key is set
-    api_key = os.getenv('LINEAR_API_KEY')
+    api_key = settings().linear_api_key
     if not api_key:
         print("❌ LINEAR_API_KEY not found in environment variables")
         print("Please set it in your .env file")
@@ -28,39 +213,14 @@ def test_linear_connection():
     
     print("✅ LINEAR_API_KEY found")
     
-    # Test API connection
-    url = 'https://api.linear.app/graphql'
-    headers = {
-        'Authorization': api_key,
-        'Content-Type': 'application/json',
-    }
-    
-    # Simple query to test connection
-    query = """
-    query {
-        viewer {
-            id
-            name
-            email
-        }
-    }
-    """
-    
-    payload = {
-        'query': query
-    }
-    
     try:
-        response = requests.post(url, json=payload, headers=headers)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = probe_result('viewer')
         
         if 'errors' in data:
             print(f"❌ API Error: {data['errors']}")
             return False
         
-        viewer = data.get('data', {}).get('viewer')
+        viewer = (data.get('data') or {}).get('viewer')
         if viewer:
             print(f"✅ Connected successfully!")
             print(f"   User: {viewer.get('name', 'Unknown')} ({viewer.get('email', 'Unknown')})")
@@ -77,60 +237,32 @@ def test_workspace_access():
     """Test workspace access"""
     print("\n🏢 Testing workspace access...")
     
-    api_key = os.getenv('LINEAR_API_KEY')
-    workspace_url = os.getenv('LINEAR_WORKSPACE_URL', 'https://linear.app/your-workspace')
+    workspace_url = settings().linear_workspace_url
     
     if workspace_url == 'https://linear.app/your-workspace':
         print("⚠️  LINEAR_WORKSPACE_URL not configured (using default)")
     
-    # Test workspace query
-    url = 'https://api.linear.app/graphql'
-    headers = {
-        'Authorization': api_key,
-        'Content-Type': 'application/json',
-    }
-    
-    query = """
-    query {
-        organization {
-            id
-            name
-            teams {
-                nodes {
-                    id
-                    name
-                }
-            }
-        }
-    }
-    """
-    
-    payload = {
-        'query': query
-    }
-    
     try:
-        response = requests.post(url, json=payload, headers=headers)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = probe_result('organization')
         
         if 'errors' in data:
             print(f"❌ Workspace access error: {data['errors']}")
             return False
         
-        organization = data.get('data', {}).get('organization')
+        organization = (data.get('data') or {}).get('organization')
         if organization:
             print(f"✅ Workspace access successful!")
             print(f"   Organization: {organization.get('name', 'Unknown')}")
             
-            teams = organization.get('teams', {}).get('nodes', [])
+            connection = organization.get('teams') or {}
+            teams = connection.get('nodes', [])
+            more = '+' if (connection.get('pageInfo') or {}).get('hasNextPage') else ''
             if teams:
-                print(f"   Teams found: {len(teams)}")
+                print(f"   Teams found: {len(teams)}{more}")
                 for team in teams[:3]:  # Show first 3 teams
                     print(f"     - {team.get('name', 'Unknown')}")
                 if len(teams) > 3:
-                    print(f"     ... and {len(teams) - 3} more")
+                    print(f"     ... and {len(teams) - 3}{more} more")
             else:
                 print("   No teams found")
             
@@ -147,50 +279,25 @@ def test_views_access():
     """Test views access"""
     print("\n📊 Testing views access...")
     
-    api_key = os.getenv('LINEAR_API_KEY')
-    url = 'https://api.linear.app/graphql'
-    headers = {
-        'Authorization': api_key,
-        'Content-Type': 'application/json',
-    }
-    
-    query = """
-    query {
-        viewer {
-            organization {
-                teams {
-                    nodes {
-                        id
-                        name
-                    }
-                }
-            }
-        }
-    }
-    """
-    
-    payload = {
-        'query': query
-    }
-    
     try:
-        response = requests.post(url, json=payload, headers=headers)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = probe_result('teams')
         
         if 'errors' in data:
             print(f"❌ Views access error: {data['errors']}")
             return False
         
-        teams = data.get('data', {}).get('viewer', {}).get('organization', {}).get('teams', {}).get('nodes', [])
+        # Only TEAMS_PAGE_SIZE teams are requested; Linear has no total count,
+        # so a further page is shown as a '+' on the count
+        connection = (((data.get('data') or {}).get('viewer') or {}).get('organization') or {}).get('teams') or {}
+        teams = connection.get('nodes', [])
+        more = '+' if (connection.get('pageInfo') or {}).get('hasNextPage') else ''
         if teams:
             print(f"✅ Teams access successful!")
-            print(f"   Teams found: {len(teams)}")
-            for team in teams[:5]:  # Show first 5 teams
+            print(f"   Teams found: {len(teams)}{more}")
+            for team in teams:
                 print(f"     - {team.get('name', 'Unknown')}")
-            if len(teams) > 5:
-                print(f"     ... and {len(teams) - 5} more")
+            if more:
+                print("     ... and more")
             return True
         else:
             print("⚠️  No teams found")
@@ -200,69 +307,58 @@ def test_views_access():
         print(f"❌ Teams access failed: {e}")
         return False
 
-def test_release_labels():
-    """Test release labels access"""
-    print("\n🏷️ Testing release labels access...")
+def find_version_labels(connection):
+    """Return the version-named labels in a labels connection
     
-    api_key = os.getenv('LINEAR_API_KEY')
-    url = 'https://api.linear.app/graphql'
-    headers = {
-        'Authorization': api_key,
-        'Content-Type': 'application/json',
-    }
-    
-    query = """
-    query {
-        viewer {
-            organization {
-                labels {
-                    nodes {
-                        name
-                        createdAt
-                        parent {
-                            name
-                        }
-                    }
-                }
-            }
-        }
-    }
+    If a page has none, the following pages are fetched until one does or the
+    labels run out. Returns (labels, has_more, errors); errors is the GraphQL
+    error list that stopped paging, or None.
     """
+    labels = [label for label in connection.get('nodes', []) if _RELEASE_RE.match(label.get('name', ''))]
+    page_info = connection.get('pageInfo') or {}
     
-    payload = {
-        'query': query
-    }
+    while not labels and page_info.get('hasNextPage'):
+        body = orjson.dumps({'query': VERSION_LABELS_QUERY, 'variables': {'after': page_info.get('endCursor')}})
+        response = run_query(body)
+        if response.get('errors'):
+            return labels, True, response['errors']
+        
+        connection = (((response.get('data') or {}).get('viewer') or {}).get('organization') or {}).get('labels') or {}
+        labels = [label for label in connection.get('nodes', []) if _RELEASE_RE.match(label.get('name', ''))]
+        page_info = connection.get('pageInfo') or {}
+    
+    return labels, bool(page_info.get('hasNextPage')), None
+
+def test_release_labels():
+    """Test release labels access"""
+    print("\n🏷️ Testing release labels access...")
     
     try:
-        response = requests.post(url, json=payload, headers=headers)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = probe_result('labels')
         
         if 'errors' in data:
             print(f"❌ Release labels access error: {data['errors']}")
             return False
         
-        labels = data.get('data', {}).get('viewer', {}).get('organization', {}).get('labels', {}).get('nodes', [])
+        # Labels in the "Release" group are filtered by Linear; other labels
+        # count too when they start with a version number
+        organization = ((data.get('data') or {}).get('viewer') or {}).get('organization') or {}
+        grouped = organization.get('labels') or {}
+        version_labels, versions_more, errors = find_version_labels(organization.get('versionLabels') or {})
+        if errors:
+            print(f"❌ Release labels access error: {errors}")
+            return False
         
-        # Filter for labels that belong to the "Release" group
-        release_labels = []
-        for label in labels:
-            # Check if the label has a parent group named "Release"
-            parent = label.get('parent')
-            if parent and parent.get('name') == 'Release':
-                release_labels.append(label)
-            # Also include labels that start with version numbers (fallback)
-            elif re.match(r'^\d+\.\d+\.\d+', label['name']):
-                release_labels.append(label)
+        release_labels = grouped.get('nodes', []) + version_labels
+        more = '+' if versions_more or (grouped.get('pageInfo') or {}).get('hasNextPage') else ''
         
         if release_labels:
             print(f"✅ Release labels access successful!")
-            print(f"   Release labels found: {len(release_labels)}")
+            print(f"   Release labels found: {len(release_labels)}{more}")
             for label in release_labels[:5]:  # Show first 5 labels
                 print(f"     - {label.get('name', 'Unknown')}")
             if len(release_labels) > 5:
-                print(f"     ... and {len(release_labels) - 5} more")
+                print(f"     ... and {len(release_labels) - 5}{more} more")
             return True
         else:
             print("⚠️  No release labels found")
@@ -274,6 +370,22 @@ def test_release_labels():
 
 def main():
     """Main test function"""
+    # When output goes to a pipe or log collector, block-buffer stdout for the
+    # run instead of flushing after every line; the report is written out in a
+    # few large chunks and flushed at the end. Terminals keep line buffering so
+    # progress shows up while requests are retried
+    line_buffering = None if sys.stdout.isatty() else getattr(sys.stdout, 'line_buffering', None)
+    if line_buffering is not None:
+        sys.stdout.reconfigure(line_buffering=False)
+    try:
+        _run_tests()
+    finally:
+        sys.stdout.flush()
+        if line_buffering is not None:
+            sys.stdout.reconfigure(line_buffering=line_buffering)
+
+def _run_tests():
+    """Run each connection test in order and print the summary"""
     print("🚀 Linear Release Notes Generator - Connection Test")
     print("=" * 60)
     
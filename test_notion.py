@@ -3,18 +3,18 @@
 Test script for Notion integration
 """
 
-import os
-from dotenv import load_dotenv
+from env_bootstrap import ensure_loaded
+from config import settings
 
 # Load environment variables
-load_dotenv()
+ensure_loaded()
 
 def test_notion_setup():
     """Test Notion setup and configuration"""
     print("🔍 Testing Notion Integration...")
     
     # Check if Notion token is configured
-    notion_token = os.getenv('NOTION_TOKEN')
+    notion_token = settings().notion_token
     if not notion_token:
         print("❌ NOTION_TOKEN not found in environment variables")
         print("Please add NOTION_TOKEN to your .env file")
@@ -28,8 +28,8 @@ def test_notion_setup():
     
     # Test Notion connection
     try:
-        from notion_integration import NotionIntegration
-        notion = NotionIntegration()
+        from notion_integration import db_title, get_shared
+        notion = get_shared()
         
         # Test getting databases
         databases = notion.get_databases()
@@ -38,7 +38,7 @@ def test_notion_setup():
         if databases:
             print("📊 Available databases:")
             for db in databases[:3]:  # Show first 3 databases
-                title = db.get('title', [{}])[0].get('plain_text', 'Untitled')
+                title = db_title(db)
                 print(f"   - {title}")
             if len(databases) > 3:
                 print(f"   ... and {len(databases) - 3} more")
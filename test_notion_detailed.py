@@ -3,11 +3,11 @@
 Detailed Notion integration test
 """
 
-import os
-from dotenv import load_dotenv
+from env_bootstrap import ensure_loaded
+from config import settings
 
 # Load environment variables
-load_dotenv()
+ensure_loaded()
 
 def test_notion_detailed():
     """Detailed test of Notion integration"""
@@ -15,7 +15,7 @@ def test_notion_detailed():
     print("=" * 50)
     
     # Check token
-    notion_token = os.getenv('NOTION_TOKEN')
+    notion_token = settings().notion_token
     if not notion_token:
         print("❌ NOTION_TOKEN not found")
         return False
@@ -23,8 +23,8 @@ def test_notion_detailed():
     print(f"✅ NOTION_TOKEN found: {notion_token[:10]}...")
     
     try:
-        from notion_integration import NotionIntegration
-        notion = NotionIntegration()
+        from notion_integration import db_title, get_shared, query_all
+        notion = get_shared()
         print("✅ NotionIntegration initialized")
         
         # Test basic API access
@@ -44,7 +44,7 @@ def test_notion_detailed():
         
         if databases:
             for db in databases:
-                title = db.get('title', [{}])[0].get('plain_text', 'Untitled')
+                title = db_title(db)
                 db_id = db.get('id', 'Unknown')
                 print(f"  - {title} ({db_id})")
         else:
@@ -55,14 +55,13 @@ def test_notion_detailed():
             print("   3. The integration token doesn't have the right permissions")
         
         # Test specific database if provided
-        db_id = os.getenv('NOTION_DATABASE_ID')
+        db_id = settings().notion_db_id
         if db_id:
             print(f"\n🔍 Testing specific database: {db_id}")
             try:
-                # Try to query the specific database
-                response = notion.client.databases.query(database_id=db_id)
-                pages = response.get('results', [])
-                print(f"✅ Database access successful - Found {len(pages)} pages")
+                # Query the specific database, following every page of results
+                total = sum(len(pages) for pages in query_all(notion.client, db_id))
+                print(f"✅ Database access successful - Found {total} pages")
             except Exception as e:
                 print(f"❌ Database access failed: {e}")
                 print("   Make sure the database is shared with the integration")
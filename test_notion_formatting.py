@@ -3,12 +3,11 @@
 Test script for enhanced Notion markdown formatting
 """
 
-import os
-from dotenv import load_dotenv
-from notion_integration import NotionIntegration
+from env_bootstrap import ensure_loaded
+from config import settings
 
 # Load environment variables
-load_dotenv()
+ensure_loaded()
 
 def test_notion_formatting():
     """Test the enhanced markdown formatting functionality"""
@@ -16,7 +15,7 @@ def test_notion_formatting():
     print("=" * 50)
     
     # Check token
-    notion_token = os.getenv('NOTION_TOKEN')
+    notion_token = settings().notion_token
     if not notion_token:
         print("❌ NOTION_TOKEN not found")
         return False
@@ -24,7 +23,8 @@ def test_notion_formatting():
     print(f"✅ NOTION_TOKEN found: {notion_token[:10]}...")
     
     try:
-        notion = NotionIntegration()
+        from notion_integration import get_shared
+        notion = get_shared()
         print("✅ NotionIntegration initialized")
         
         # Test markdown formatting
@@ -54,9 +54,9 @@ def test_notion_formatting():
         
         print(f"Generated {len(blocks)} blocks:")
         for i, block in enumerate(blocks[:5]):  # Show first 5 blocks
-            block_type = block.get('type', 'unknown')
-            rich_text = block.get(block_type, {}).get('rich_text', [])
-            content = ' '.join([rt.get('text', {}).get('content', '') for rt in rich_text])
+            # Blocks built by _markdown_to_notion_blocks always carry these keys
+            block_type = block['type']
+            content = ''.join(rt['text']['content'] for rt in block[block_type]['rich_text'])
             print(f"  {i+1}. {block_type}: {content[:50]}...")
         
         return True
@@ -3,12 +3,11 @@
 Test script for enhanced Notion properties
 """
 
-import os
-from dotenv import load_dotenv
-from notion_integration import NotionIntegration
+from env_bootstrap import ensure_loaded
+from config import settings
 
 # Load environment variables
-load_dotenv()
+ensure_loaded()
 
 def test_notion_properties():
     """Test the enhanced Notion properties functionality"""
@@ -16,7 +15,7 @@ def test_notion_properties():
     print("=" * 50)
     
     # Check token
-    notion_token = os.getenv('NOTION_TOKEN')
+    notion_token = settings().notion_token
     if not notion_token:
         print("❌ NOTION_TOKEN not found")
         return False
@@ -24,11 +23,12 @@ def test_notion_properties():
     print(f"✅ NOTION_TOKEN found: {notion_token[:10]}...")
     
     try:
-        notion = NotionIntegration()
+        from notion_integration import get_shared
+        notion = get_shared()
         print("✅ NotionIntegration initialized")
         
         # Test database schema retrieval
-        db_id = os.getenv('NOTION_DATABASE_ID')
+        db_id = settings().notion_db_id
         if db_id:
             print(f"\n🔍 Testing database schema for: {db_id}")
             schema = notion._get_database_schema(db_id)
@@ -4,10 +4,12 @@ Test script to debug password authentication issues
 """
 
 import os
-from dotenv import load_dotenv
+from pathlib import Path
+from env_bootstrap import ensure_loaded
+from config import settings
 
 # Load environment variables
-load_dotenv()
+ensure_loaded()
 
 def test_password_setup():
     """Test password setup and configuration"""
@@ -16,7 +18,7 @@ def test_password_setup():
     
     # Test 1: Check .env file
     print("\n1. Checking .env file:")
-    env_password = os.getenv('APP_PASSWORD')
+    env_password = settings().app_password
     if env_password:
         print(f"   ✅ APP_PASSWORD found in .env: {'*' * len(env_password)} (length: {len(env_password)})")
     else:
@@ -24,17 +26,17 @@ def test_password_setup():
     
     # Test 2: Check if .env file exists
     print("\n2. Checking .env file existence:")
-    if os.path.exists('.env'):
-        print("   ✅ .env file exists")
-        # Read the .env file to see what's in it
-        with open('.env', 'r') as f:
-            env_content = f.read()
-            if 'APP_PASSWORD' in env_content:
-                print("   ✅ APP_PASSWORD found in .env file content")
-            else:
-                print("   ❌ APP_PASSWORD not found in .env file content")
-    else:
+    try:
+        env_data = Path('.env').read_bytes()
+    except FileNotFoundError:
         print("   ❌ .env file does not exist")
+    else:
+        print(f"   ✅ .env file exists ({len(env_data)} bytes)")
+        # Only an assignment at the start of a line counts, not a mention in a comment
+        if b'\nAPP_PASSWORD=' in b'\n' + env_data:
+            print("   ✅ APP_PASSWORD found in .env file content")
+        else:
+            print("   ❌ APP_PASSWORD not found in .env file content")
     
     # Test 3: Check environment variable loading
     print("\n3. Testing environment variable loading:")
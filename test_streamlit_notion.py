@@ -3,21 +3,23 @@
 Test Streamlit Notion integration
 """
 
-import streamlit as st
-import os
-from dotenv import load_dotenv
+from env_bootstrap import ensure_loaded
+from config import settings
 
 # Load environment variables
-load_dotenv()
+ensure_loaded()
 
 def main():
+    # Streamlit is heavy to import, so only load it when the page is actually run
+    import streamlit as st
+    
     st.title("Notion Integration Test")
     
     # Test environment variables
     st.subheader("Environment Variables")
     
     # Test local env
-    notion_token_env = os.getenv('NOTION_TOKEN')
+    notion_token_env = settings().notion_token
     if notion_token_env:
         st.success(f"✅ NOTION_TOKEN from .env: {notion_token_env[:10]}...")
     else:
@@ -39,8 +41,8 @@ def main():
     # Test NotionIntegration
     st.subheader("Notion Integration Test")
     try:
-        from notion_integration import NotionIntegration
-        notion = NotionIntegration()
+        from notion_integration import db_title, get_shared
+        notion = get_shared()
         st.success("✅ NotionIntegration initialized successfully")
         
         # Test databases
@@ -49,7 +51,7 @@ def main():
         
         if databases:
             for db in databases[:3]:
-                title = db.get('title', [{}])[0].get('plain_text', 'Untitled')
+                title = db_title(db)
                 st.write(f"- {title} ({db['id']})")
         else:
             st.warning("No databases found. Make sure to share your databases with the integration.")
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Freeze .env into env_snapshot.py so scripts import their settings instead of parsing .env
+
+Run again after editing .env: python tools/freeze_env.py
+The snapshot contains secrets, so it is gitignored and written owner-readable only.
+"""
+
+import os
+import sys
+from dotenv import dotenv_values
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV_FILE = os.path.join(ROOT, '.env')
+SNAPSHOT_FILE = os.path.join(ROOT, 'env_snapshot.py')
+
+def freeze_env(env_file=ENV_FILE, snapshot_file=SNAPSHOT_FILE):
+    """Write the variables in env_file to snapshot_file as an ENV dict
+    
+    Returns the number of variables written.
+    """
+    values = {key: value for key, value in dotenv_values(env_file).items() if value is not None}
+    
+    lines = ["# Generated by tools/freeze_env.py from .env - do not edit or commit\n", "ENV = {\n"]
+    lines.extend(f"    {key!r}: {value!r},\n" for key, value in sorted(values.items()))
+    lines.append("}\n")
+    
+    tmp_path = snapshot_file + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+    os.chmod(tmp_path, 0o600)
+    os.replace(tmp_path, snapshot_file)
+    return len(values)
+
+def main():
+    if not os.path.exists(ENV_FILE):
+        print(f"❌ No .env file found at {ENV_FILE}")
+        sys.exit(1)
+    
+    count = freeze_env()
+    print(f"✅ Wrote {count} variables to {SNAPSHOT_FILE}")
+
+if __name__ == "__main__":
+    main()